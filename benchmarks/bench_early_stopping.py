@@ -0,0 +1,58 @@
+"""
+Generaciones ahorradas por la parada anticipada con los parámetros por
+defecto de genetic_algorithm (los de la página de prueba), también con
+elitismo y con reemplazo estacionario. Ambos tardan más en llegar a
+tol_abs que el reemplazo generacional puro porque aumentan la presión
+selectiva sobre una población de 10 (ver Replacement); las últimas filas
+los repiten con un torneo más pequeño.
+
+    python benchmarks/bench_early_stopping.py --runs 50 --generations 500
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from taller2ag import genetic_algorithm
+
+CRITERIA = {
+    "sin parada": {},
+    "tol_abs=0.5": {"tol_abs": 0.5},
+    "tol_rel=1e-4": {"tol_rel": 1e-4},
+    "patience=50": {"patience": 50},
+    "min_diversity=0.1": {"min_diversity": 0.1},
+    "tol_abs + patience": {"tol_abs": 0.5, "patience": 50},
+    "tol_abs, elitism=2": {"tol_abs": 0.5, "elitism": 2},
+    "tol_abs, steady=4": {"tol_abs": 0.5, "replacement": "steady_state", "steady_state_size": 4},
+    # menos presión del torneo para compensar la que añaden elitismo y reemplazo estacionario
+    "tol_abs, e=2, sel=0.2": {"tol_abs": 0.5, "elitism": 2, "selection_param": 0.2},
+    "tol_abs, st=4, sel=0.2": {"tol_abs": 0.5, "replacement": "steady_state", "steady_state_size": 4,
+                               "selection_param": 0.2},
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--generations", type=int, default=500)
+    parser.add_argument("--engine", default="python", choices=["python", "numpy"])
+    args = parser.parse_args(argv)
+
+    print(f"{'criterio':<24}{'gens medias':>12}{'ahorro':>9}{'error medio':>13}{'tiempo (s)':>12}")
+    for name, criteria in CRITERIA.items():
+        gens, errors = [], []
+        t0 = time.perf_counter()
+        for seed in range(args.runs):
+            result = genetic_algorithm(args.generations, 41, "invierno", engine=args.engine,
+                                       seed=seed, recorder="summary", **criteria)
+            gens.append(result["generations"])
+            errors.append(result["fitness"])
+        elapsed = time.perf_counter() - t0
+        mean_gens = statistics.fmean(gens)
+        print(f"{name:<24}{mean_gens:>12.1f}{1 - mean_gens/args.generations:>9.1%}"
+              f"{statistics.fmean(errors):>13.4f}{elapsed:>12.2f}")
+
+if __name__ == "__main__":
+    main()
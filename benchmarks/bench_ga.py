@@ -0,0 +1,190 @@
+"""
+Suite de benchmarks del motor del AG (sin Streamlit).
+
+    python benchmarks/bench_ga.py --quick --output bench.json
+    python benchmarks/bench_ga.py --baseline bench.json --threshold 0.15
+
+Mide generaciones/s y evaluaciones de fitness/s para cada combinación de
+crossover_method × mutation_method × adaptation_method y tamaño de
+población, micro-benchmarks de los operadores y la memoria pico del
+historial devuelto. La salida JSON se puede comparar con una línea base:
+cualquier métrica que empeore más que el umbral se informa como regresión
+y el proceso termina con código 1.
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import taller2ag
+from taller2ag import genetic_algorithm
+
+CROSSOVERS = ["arithmetic_crossover", "blx_alpha", "sbx"]
+MUTATIONS = ["gaussian_mutation", "polynomial_mutation"]
+ADAPTATIONS = ["diversity", "fitness"]
+SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+QUICK_SIZES = [10, 1000, 100_000]
+
+def generations_for(size, budget):
+    """Generaciones por corrida para que el coste total sea ~budget individuos."""
+    return max(3, min(100, budget // size))
+
+def bench_engine(engine, sizes, budget, max_python_size, repeat):
+    results = {}
+    for size, cross, mut, adapt in itertools.product(sizes, CROSSOVERS, MUTATIONS, ADAPTATIONS):
+        if engine == "python" and size > max_python_size:
+            continue
+        gens = generations_for(size, budget)
+        best = None
+        for rep in range(repeat):
+            t0 = time.perf_counter()
+            genetic_algorithm(gens, 41, "invierno", len_poblation=size, engine=engine, seed=rep,
+                              crossover_method=cross, mutation_method=mut, adaptation_method=adapt,
+                              recorder="summary")
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        key = f"ga[{engine},{cross},{mut},{adapt},n={size}]"
+        results[f"{key}.generations_per_s"] = {"value": gens / best, "unit": "gen/s", "higher_is_better": True}
+        results[f"{key}.fitness_evals_per_s"] = {"value": (gens + 1) * size / best, "unit": "eval/s", "higher_is_better": True}
+    return results
+
+def bench_micro(number):
+    rnd = random.Random(0)
+    pop = [rnd.uniform(0, 10000) for _ in range(100)]
+    cases = {
+        "ranking_selection(n=100)": lambda: taller2ag.ranking_selection(pop, 3226.9, 0.5),
+        "RankedPopulation.tournament(n=100)": (lambda ranked=taller2ag.RankedPopulation(pop, 3226.9): ranked.tournament(0.5)),
+        "sbx": lambda: taller2ag.sbx(1000.0, 5000.0, 2),
+        "blx_alpha": lambda: taller2ag.blx_alpha(1000.0, 5000.0, 0.3),
+        "arithmetic_crossover": lambda: taller2ag.arithmetic_crossover(1000.0, 5000.0),
+        "gaussian_mutation": lambda: taller2ag.gaussian_mutation(3000.0, 0, 10000),
+        "polynomial_mutation": lambda: taller2ag.polynomial_mutation(3000.0, 0, 10000, 20),
+        "diversity_adaptation(n=100)": lambda: taller2ag.diversity_adaptation(pop, 0.1, 0.4, 0.3, 0.7, 0.035, 0.08),
+        "PopulationStats(n=100)": lambda: taller2ag.PopulationStats(pop, 3226.9).as_dict(),
+    }
+    try:
+        import numpy as np
+        import ga_numpy
+        from solar_geometry import LayoutObjective, ShadingObjective, SpacingTiltObjective
+        rng = np.random.default_rng(0)
+        arr = rng.uniform(0, 10000, 100_000)
+        p1, p2 = arr[0::2], arr[1::2]
+        cases.update({
+            "np.sbx(n=100k)": lambda: ga_numpy.sbx(p1, p2, 2, rng=rng),
+            "np.blx_alpha(n=100k)": lambda: ga_numpy.blx_alpha(p1, p2, 0.3, rng=rng),
+            "np.polynomial_mutation(n=100k)": lambda: ga_numpy.polynomial_mutation(arr, 0, 10000, 20, rng=rng),
+            "np.diversity_adaptation(n=100k)": lambda: ga_numpy.diversity_adaptation(arr, 0.1, 0.4, 0.3, 0.7, 0.035, 0.08),
+        })
+        for metric in ["shaded_hours", "lost_irradiance"]:
+            objective = ShadingObjective(41, 1476, 45, metric)
+            cases[f"np.{metric}(n=1000)"] = (lambda objective=objective: objective(arr[:1000]))
+        spacing_tilt = SpacingTiltObjective(41)
+        vector_pop = np.column_stack([arr[:1000], rng.uniform(0, 90, 1000)])
+        cases["np.SpacingTiltObjective(n=1000)"] = lambda: spacing_tilt(vector_pop)
+        field = LayoutObjective(41, 100, 100*3500, terrain_slope=2.0)
+        layouts = field.repair(rng.uniform(field.lower, field.upper, (50, 99)))
+        cases["np.LayoutObjective(rows=100,n=50)"] = lambda: field(layouts)
+    except ImportError:
+        pass
+    results = {}
+    for name, fn in cases.items():
+        n = number if not name.startswith("np.") else max(1, number // 1000)
+        best = min(timeit.repeat(fn, number=n, repeat=3)) / n
+        results[f"micro[{name}].seconds_per_call"] = {"value": best, "unit": "s", "higher_is_better": False}
+    return results
+
+def bench_memory(engine, size, gens):
+    results = {}
+    for recorder in ["list", "array", "summary"]:
+        tracemalloc.start()
+        genetic_algorithm(gens, 41, "invierno", len_poblation=size, engine=engine, seed=0, recorder=recorder)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"memory[{engine},{recorder},n={size},gens={gens}].peak_bytes"] = {
+            "value": peak, "unit": "B", "higher_is_better": False}
+    return results
+
+def compare(current, baseline, threshold):
+    """Devuelve las métricas que empeoran más que threshold respecto a baseline."""
+    regressions = []
+    for key, base in baseline["results"].items():
+        if key not in current["results"]:
+            continue
+        old, new = base["value"], current["results"][key]["value"]
+        if old <= 0:
+            continue
+        change = (new - old) / old if base["higher_is_better"] else (old - new) / old
+        if change < -threshold:
+            regressions.append((key, old, new, change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", default=["python", "numpy"], choices=["python", "numpy"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=None)
+    parser.add_argument("--quick", action="store_true", help="tamaños reducidos y una sola repetición")
+    parser.add_argument("--budget", type=int, default=2_000_000, help="individuos evaluados por corrida")
+    parser.add_argument("--max-python-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--micro-number", type=int, default=20_000)
+    parser.add_argument("--skip", nargs="*", default=[], choices=["engine", "micro", "memory"])
+    parser.add_argument("--output", help="archivo JSON de salida (por defecto stdout)")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="empeoramiento relativo tolerado")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        sizes = args.sizes or QUICK_SIZES
+        args.repeat, args.budget, args.micro_number = 1, 200_000, 2_000
+    else:
+        sizes = args.sizes or SIZES
+
+    results = {}
+    if "engine" not in args.skip:
+        for engine in args.engines:
+            results.update(bench_engine(engine, sizes, args.budget, args.max_python_size, args.repeat))
+    if "micro" not in args.skip:
+        results.update(bench_micro(args.micro_number))
+    if "memory" not in args.skip:
+        for engine in args.engines:
+            results.update(bench_memory(engine, 1000, 100))
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": numpy_version,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold)
+        for key, old, new, change in regressions:
+            print(f"REGRESIÓN {key}: {old:.4g} -> {new:.4g} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones por encima de {args.threshold:.0%}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
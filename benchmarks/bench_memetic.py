@@ -0,0 +1,49 @@
+"""
+Generaciones ahorradas por la etapa memética: compara las generaciones
+necesarias para llegar a un error de --tol mm con y sin búsqueda local,
+junto con las evaluaciones de fitness extra que consume.
+
+    python benchmarks/bench_memetic.py --runs 30 --tol 0.01
+"""
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from taller2ag import genetic_algorithm
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--generations", type=int, default=500)
+    parser.add_argument("--tol", type=float, default=0.01)
+    parser.add_argument("--len-poblation", type=int, default=10)
+    parser.add_argument("--engine", default="python", choices=["python", "numpy"])
+    args = parser.parse_args(argv)
+
+    configs = {
+        "sin memético": {},
+        "cada 10, top 1": {"memetic_every": 10},
+        "cada 5, top 2": {"memetic_every": 5, "memetic_top_k": 2},
+        "cada 10, presupuesto 100": {"memetic_every": 10, "memetic_budget": 100},
+    }
+    print(f"{'configuración':<26}{'gens medias':>12}{'evals GA':>11}{'evals extra':>13}{'ahorro gens':>13}")
+    baseline = None
+    for name, memetic in configs.items():
+        gens, ga_evals, extra = [], [], []
+        for seed in range(args.runs):
+            result = genetic_algorithm(args.generations, 41, "invierno", len_poblation=args.len_poblation,
+                                       engine=args.engine, seed=seed, recorder="summary",
+                                       tol_abs=args.tol, **memetic)
+            gens.append(result["generations"])
+            ga_evals.append((result["generations"] + 1) * args.len_poblation)
+            extra.append(result.get("memetic", {}).get("evaluations", 0))
+        mean_gens = statistics.fmean(gens)
+        baseline = mean_gens if baseline is None else baseline
+        print(f"{name:<26}{mean_gens:>12.1f}{statistics.fmean(ga_evals):>11.0f}"
+              f"{statistics.fmean(extra):>13.1f}{baseline - mean_gens:>13.1f}")
+
+if __name__ == "__main__":
+    main()
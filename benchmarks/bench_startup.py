@@ -0,0 +1,106 @@
+"""
+Tiempo de arranque de la línea de comandos frente a la página de Streamlit.
+
+    python benchmarks/bench_startup.py --repeat 10 --output startup.json
+    python benchmarks/bench_startup.py --baseline startup.json --threshold 0.25
+
+Cada caso se lanza en un proceso nuevo y se toma el mínimo y la mediana del
+tiempo de reloj; también se comprueba qué módulos pesados quedan cargados.
+La salida usa el mismo formato JSON que bench_ga.py y se compara con una
+línea base de la misma forma.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_ga import compare
+
+HEAVY = ("numpy", "pandas", "matplotlib", "streamlit")
+
+CASES = {
+    "python -S -c pass": ["-S", "-c", "pass"],
+    "import taller2ag": ["-c", "import taller2ag"],
+    "cli run --generations 1": ["-m", "taller2ag", "run", "--generations", "1"],
+    "cli run --generations 1 --engine numpy": ["-m", "taller2ag", "run", "--generations", "1", "--engine", "numpy"],
+    "import streamlit, pandas, numpy, matplotlib": ["-c", "import streamlit, pandas, numpy, matplotlib.pyplot"],
+}
+
+PROBE = """
+import runpy, sys
+try:
+    {run}
+finally:
+    print(",".join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)
+"""
+
+def loaded_modules(args):
+    """Módulos pesados presentes en sys.modules al terminar el caso."""
+    if args[0] == "-m":
+        run = f"sys.argv = {args[1:]!r}; runpy.run_module({args[1]!r}, run_name='__main__', alter_sys=True)"
+    else:
+        run = f"exec({args[-1]!r})"
+    proc = subprocess.run([sys.executable, "-c", PROBE.format(run=run, heavy=HEAVY)],
+                          cwd=ROOT, capture_output=True, text=True)
+    lines = proc.stderr.strip().splitlines()
+    return [m for m in lines[-1].split(",") if m] if lines else []
+
+def time_case(args, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True, capture_output=True)
+        times.append(time.perf_counter() - t0)
+    return min(times), statistics.median(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="archivo JSON de salida (por defecto stdout)")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.25, help="empeoramiento relativo tolerado")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, case in CASES.items():
+        try:
+            best, median = time_case(case, args.repeat)
+        except subprocess.CalledProcessError:
+            print(f"omitido (falla o falta una dependencia): {name}", file=sys.stderr)
+            continue
+        results[f"startup[{name}].min_s"] = {"value": best, "unit": "s", "higher_is_better": False}
+        results[f"startup[{name}].median_s"] = {"value": median, "unit": "s", "higher_is_better": False}
+        print(f"{name:<45}{best*1000:>8.1f} ms  {', '.join(loaded_modules(case)) or '-'}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold)
+        for key, old, new, change in regressions:
+            print(f"REGRESIÓN {key}: {old:.4g} -> {new:.4g} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones por encima de {args.threshold:.0%}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import pickle
+import time
+
+from taller2ag import genetic_algorithm
+
+# Puntos de control de genetic_algorithm: el estado completo de la corrida
+# (ver iter_generations) más sus parámetros y el historial registrado se
+# guardan en un pickle binario; resume() continúa la corrida desde el
+# archivo de forma idéntica a una corrida sin interrumpir con la misma
+# semilla.
+
+CHECKPOINT_VERSION = 1
+
+class Checkpointer:
+    """
+    Guarda un punto de control en path cada 'every' generaciones y/o cada
+    'interval' segundos. Cada escritura reemplaza la anterior de forma
+    atómica (archivo temporal + os.replace), así que un proceso terminado a
+    mitad de escritura deja intacto el último punto de control.
+    """
+    def __init__(self, path, every=None, interval=None):
+        if every is None and interval is None:
+            raise ValueError("Hay que indicar every o interval")
+        self.path = os.fspath(path)
+        self.every = every
+        self.interval = interval
+        self.extra = {}
+        self.saves = 0
+        self.last_save = time.monotonic()
+
+    def attach(self, **extra):
+        """Datos que se añaden a cada punto de control (parámetros, historial...)."""
+        self.extra.update(extra)
+
+    def due(self, gen):
+        if self.every is not None and gen % self.every == 0:
+            return True
+        return self.interval is not None and time.monotonic() - self.last_save >= self.interval
+
+    def save(self, state):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": CHECKPOINT_VERSION, **self.extra, **state}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self.last_save = time.monotonic()
+        self.saves += 1
+
+def load_checkpoint(path):
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Versión de punto de control no soportada: {state.get('version')}")
+    return state
+
+def resume(path, checkpoint=None, **overrides):
+    """
+    Continúa la corrida guardada en path y devuelve el mismo dict que
+    genetic_algorithm. overrides se pasan a genetic_algorithm (p. ej.
+    profiler o un nuevo checkpoint para seguir guardando).
+    """
+    state = load_checkpoint(path)
+    return genetic_algorithm(**{**state["params"], **overrides}, checkpoint=checkpoint, resume=state)
@@ -0,0 +1,205 @@
+"""
+Ejecución del AG desde la línea de comandos, sin Streamlit.
+
+    python -m taller2ag run --latitude 41 --season invierno --generations 100
+    python -m taller2ag run --engine numpy --set len_poblation=1000 --history --format csv
+    python -m taller2ag batch configs.json --workers 4 --output resultados.csv
+    python -m taller2ag layout --rows 40 --length 160000 --slope 3 --format csv
+    python -m taller2ag tune --candidates 27 --workers 4 --output preset.json
+
+Cada fila de un archivo batch (lista de objetos JSON o CSV con cabecera)
+son argumentos de genetic_algorithm; las columnas vacías se ignoran y los
+valores CSV se interpretan como JSON cuando es posible ("[1476,659,35]",
+"0.5", "null"). Solo se importa lo que necesita el modo elegido: una
+corrida con el motor de Python no carga numpy.
+"""
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+RECORD_KEYS = ("generation", "target", "pm", "pc", "stop_reason", "fitness",
+               "best", "mean", "pstdev", "min", "max", "mean_fitness")
+
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def parse_assignments(items):
+    """['clave=valor', ...] -> dict con los valores interpretados como JSON."""
+    params = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Se esperaba clave=valor: {item}")
+        params[key.strip()] = parse_value(value.strip())
+    return params
+
+def load_configs(path):
+    """Lista de dicts de parámetros desde un archivo .json o .csv."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="") as f:
+            return [{key: parse_value(value) for key, value in row.items() if value not in ("", None)}
+                    for row in csv.DictReader(f)]
+    configs = json.loads(path.read_text())
+    return configs if isinstance(configs, list) else [configs]
+
+def write_rows(rows, fmt, output):
+    out = open(output, "w", newline="") if output else sys.stdout
+    try:
+        if fmt == "json":
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+        else:
+            fields = list(dict.fromkeys(key for row in rows for key in row))
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: json.dumps(value) if isinstance(value, (list, dict)) else value
+                                 for key, value in row.items()})
+    finally:
+        if output:
+            out.close()
+
+def run_single(params, history):
+    """Una corrida con iter_generations; con history también los registros por generación."""
+    from taller2ag import iter_generations
+    records = []
+    for record in iter_generations(**params):
+        if history:
+            records.append({key: record[key] for key in RECORD_KEYS})
+    summary = {
+        "seed": record["seed"],
+        "target": record["target"],
+        "best": record["best"],
+        "fitness": record["fitness"],
+        "generations": record["generation"],
+        "stop_reason": record["stop_reason"]
+    }
+    return summary, records
+
+def cmd_run(args):
+    params = {
+        "max_generations": args.generations,
+        "latitude": args.latitude,
+        "season": args.season,
+        "engine": args.engine,
+        "seed": args.seed,
+        **parse_assignments(args.set)
+    }
+    summary, records = run_single(params, args.history)
+    if args.format == "csv":
+        write_rows(records if args.history else [summary], "csv", args.output)
+    else:
+        write_rows({**summary, "records": records} if args.history else summary, "json", args.output)
+    return 0
+
+def cmd_batch(args):
+    from ga_sweep import iter_sweep, spawn_seeds
+    configs = load_configs(args.configs)
+    overrides = parse_assignments(args.set)
+    configs = [{**overrides, **config} for config in configs]
+    if all("seed" in config for config in configs):
+        seeds = [config.pop("seed") for config in configs]
+    else:
+        seeds = spawn_seeds(len(configs), args.seed)
+        for config in configs:
+            config.pop("seed", None)
+    rows = sorted(iter_sweep(configs, args.generations, args.workers, seeds=seeds), key=lambda row: row["index"])
+    write_rows(rows, args.format, args.output)
+    return 0
+
+def cmd_layout(args):
+    from ga_vector import genetic_algorithm_vector
+    from solar_geometry import LayoutObjective
+    objective = LayoutObjective(args.latitude, args.rows, args.length, terrain_slope=parse_value(args.slope),
+                                inclination_degree=args.inclination)
+    result = genetic_algorithm_vector(objective, args.generations, seed=args.seed, **parse_assignments(args.set))
+    layout = result["decoded"]
+    if args.format == "csv":
+        spacings = [None] + layout["spacings"]
+        rows = [{"row": j, "position": layout["positions"][j], "height": layout["heights"][j],
+                 "spacing": spacings[j], "shading": layout["shading"][j], "lost_energy": layout["lost_energy"][j]}
+                for j in range(args.rows)]
+        write_rows(rows, "csv", args.output)
+    else:
+        write_rows({"seed": result["seed"], "fitness": result["fitness"], "generations": result["generations"],
+                    "stop_reason": result["stop_reason"], **layout}, "json", args.output)
+    return 0
+
+def cmd_tune(args):
+    from ga_tuner import save_preset, tune
+    instances = load_configs(args.instances) if args.instances else None
+    result = tune(instances, n_candidates=args.candidates, eta=args.eta, min_runs=args.min_runs,
+                  max_generations=args.generations, tol_abs=args.tol, max_workers=args.workers,
+                  seed=args.seed, **parse_assignments(args.set))
+    best, baseline = result["best"], result["baseline"]
+    for name, summary in (("por defecto", baseline), ("recomendado", best)):
+        print(f"{name}: coste {summary['cost']:.1f} gen [{summary['cost_ci'][0]:.1f}, {summary['cost_ci'][1]:.1f}], "
+              f"error {summary['error']:.3g} mm, éxito {summary['success_rate']:.0%} ({summary['runs']} corridas)",
+              file=sys.stderr)
+    if args.output:
+        save_preset(args.output, result["preset"])
+    else:
+        write_rows(result["preset"], "json", None)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m taller2ag", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="una corrida de genetic_algorithm")
+    run.add_argument("--latitude", type=float, default=41)
+    run.add_argument("--season", default="invierno")
+    run.add_argument("--engine", default="python", choices=["python", "numpy"])
+    run.add_argument("--seed", type=int, default=None)
+    run.add_argument("--history", action="store_true", help="incluir los registros por generación")
+    run.set_defaults(func=cmd_run)
+
+    batch = sub.add_parser("batch", help="varias corridas desde un archivo JSON o CSV")
+    batch.add_argument("configs", help="archivo .json o .csv con una configuración por fila")
+    batch.add_argument("--workers", type=int, default=1, help="procesos (1 ejecuta en este proceso)")
+    batch.add_argument("--seed", type=int, default=None, help="semilla base si las filas no traen 'seed'")
+    batch.set_defaults(func=cmd_batch)
+
+    layout = sub.add_parser("layout", help="separaciones de un campo de N filas (ga_vector)")
+    layout.add_argument("--rows", type=int, default=20)
+    layout.add_argument("--length", type=float, required=True, help="longitud disponible del terreno (mm)")
+    layout.add_argument("--slope", default="0", help="pendiente del terreno (°): un valor o una lista JSON por separación")
+    layout.add_argument("--latitude", type=float, default=41)
+    layout.add_argument("--inclination", type=float, default=45)
+    layout.add_argument("--seed", type=int, default=None)
+    layout.set_defaults(func=cmd_layout)
+
+    tune = sub.add_parser("tune", help="ajuste de parámetros por successive halving (ga_tuner)")
+    tune.add_argument("--instances", help="archivo .json o .csv con las instancias (latitude, season, ...)")
+    tune.add_argument("--candidates", type=int, default=27)
+    tune.add_argument("--eta", type=int, default=3)
+    tune.add_argument("--min-runs", type=int, default=4, help="corridas por configuración en la primera ronda")
+    tune.add_argument("--tol", type=float, default=1.0, help="tolerancia |mejor - target| (mm)")
+    tune.add_argument("--workers", type=int, default=None, help="procesos (por defecto uno por CPU)")
+    tune.add_argument("--seed", type=int, default=None)
+    tune.set_defaults(func=cmd_tune)
+
+    for p in (run, batch, layout, tune):
+        p.add_argument("--generations", type=int, default=100)
+        p.add_argument("--set", action="append", default=[], metavar="CLAVE=VALOR",
+                       help="parámetro adicional del AG (repetible)")
+        p.add_argument("--output", help="archivo de salida (por defecto stdout)")
+        if p is not tune:
+            p.add_argument("--format", choices=["json", "csv"], default="json")
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, KeyError, TypeError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
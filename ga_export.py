@@ -0,0 +1,225 @@
+import inspect
+import json
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs
+
+from taller2ag import STATS_KEYS, iter_generations
+
+# Exportación columnar de resultados de genetic_algorithm. Cada directorio
+# raíz contiene tres tablas con esquema fijo, particionadas (hive) por
+# parámetros de la corrida:
+#   runs/         una fila por corrida: parámetros y resumen,
+#   generations/  una fila por corrida y generación: pm, pc y estadísticas,
+#   populations/  (opcional) una fila por población guardada.
+# Los archivos son Parquet o Arrow IPC; con IPC la lectura se hace sobre
+# memoria mapeada y no copia los datos.
+
+EXPORT_VERSION = 2
+PARTITION_KEYS = ("season", "engine")
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+
+PARAMS_SCHEMA = pa.schema([
+    ("max_generations", pa.int32()),
+    ("latitude", pa.float64()),
+    ("season", pa.string()),
+    ("len_poblation", pa.int32()),
+    ("valor_min", pa.float64()),
+    ("valor_max", pa.float64()),
+    ("panel_dimensions", pa.list_(pa.float64())),
+    ("inclination_degree", pa.float64()),
+    ("winter_solar_decline", pa.float64()),
+    ("summer_solar_decline", pa.float64()),
+    ("adaptation_method", pa.string()),
+    ("pm_min", pa.float64()),
+    ("pm_max", pa.float64()),
+    ("pc_min", pa.float64()),
+    ("pc_max", pa.float64()),
+    ("k_m", pa.float64()),
+    ("k_c", pa.float64()),
+    ("crossover_method", pa.string()),
+    ("mutation_method", pa.string()),
+    ("selection_method", pa.string()),
+    # None: valor por defecto del operador (ver OperatorPlan)
+    ("crossover_param", pa.float64()),
+    ("mutation_param", pa.float64()),
+    ("selection_param", pa.float64()),
+    ("replacement", pa.string()),
+    ("elitism", pa.int32()),
+    ("steady_state_size", pa.int32()),
+    ("engine", pa.string()),
+    ("seed", pa.int64()),
+    ("fitness_mode", pa.string()),
+])
+
+RUNS_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    *PARAMS_SCHEMA,
+    ("target", pa.float64()),
+    ("best", pa.float64()),
+    ("fitness", pa.float64()),
+    ("generations", pa.int32()),
+    ("stop_reason", pa.string()),
+])
+
+GENERATIONS_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("generation", pa.int32()),
+    ("pm", pa.float64()),
+    ("pc", pa.float64()),
+    *[(key, pa.float64()) for key in STATS_KEYS],
+])
+
+POPULATIONS_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("generation", pa.int32()),
+    ("population", pa.large_list(pa.float64())),
+])
+
+TABLES = {"runs": RUNS_SCHEMA, "generations": GENERATIONS_SCHEMA, "populations": POPULATIONS_SCHEMA}
+
+def default_params():
+    """Valores por defecto de genetic_algorithm para las columnas de PARAMS_SCHEMA."""
+    signature = inspect.signature(iter_generations).parameters
+    return {name: signature[name].default for name in PARAMS_SCHEMA.names
+            if signature[name].default is not inspect.Parameter.empty}
+
+class ResultWriter:
+    """
+    Acumula resultados con add() y los escribe por bloques de
+    rows_per_flush corridas (y al cerrar). partition_by son columnas de
+    PARAMS_SCHEMA; file_format es "parquet" o "arrow".
+
+        with ResultWriter("resultados", include_populations=True) as writer:
+            writer.add(genetic_algorithm(**params), **params)
+    """
+    def __init__(self, root, partition_by=PARTITION_KEYS, file_format="parquet",
+                 include_populations=False, rows_per_flush=1000):
+        if file_format not in FORMATS:
+            raise ValueError(f"Formato desconocido: {file_format}")
+        unknown = set(partition_by) - set(PARAMS_SCHEMA.names)
+        if unknown:
+            raise ValueError(f"Columnas de partición desconocidas: {sorted(unknown)}")
+        self.root = Path(root)
+        self.partition_by = tuple(partition_by)
+        self.file_format = file_format
+        self.include_populations = include_populations
+        self.rows_per_flush = rows_per_flush
+        self.defaults = default_params()
+        self.pending = {name: [] for name in TABLES}
+        self.n_pending = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta = self.root / "dataset.json"
+        info = {"version": EXPORT_VERSION, "format": file_format, "partition_by": list(self.partition_by)}
+        if meta.exists():
+            existing = json.loads(meta.read_text())
+            if existing != info:
+                raise ValueError(f"{self.root} ya contiene un conjunto con otra configuración: {existing}")
+        else:
+            meta.write_text(json.dumps(info))
+
+    def add(self, result, run_id=None, **params):
+        """Añade una corrida; params son los argumentos con los que se llamó a genetic_algorithm."""
+        run_id = run_id or uuid.uuid4().hex
+        params = {**self.defaults, **{k: v for k, v in params.items() if k in PARAMS_SCHEMA.names}}
+        if params.get("seed") is None:
+            params["seed"] = result.get("seed")
+        partition = {key: params[key] for key in self.partition_by}
+        self.pending["runs"].append(pa.table({
+            "run_id": [run_id],
+            **{key: [params.get(key)] for key in PARAMS_SCHEMA.names},
+            "target": [float(result["target"])],
+            "best": [float(result["best"])],
+            "fitness": [float(result["fitness"])],
+            "generations": [result["generations"]],
+            "stop_reason": [result["stop_reason"]],
+        }, schema=RUNS_SCHEMA))
+
+        n = len(result["bests"])
+        history = np.full((n, 2), np.nan)
+        if len(result["history"]):
+            history[:len(result["history"])] = np.asarray(result["history"], dtype=np.float64)
+        columns = {
+            "run_id": pa.array([run_id] * n, pa.string()),
+            "generation": pa.array(np.arange(n, dtype=np.int32)),
+            "pm": pa.array(history[:, 0], from_pandas=True),
+            "pc": pa.array(history[:, 1], from_pandas=True),
+            **{key: pa.array(np.asarray(result["stats"][key], dtype=np.float64)) for key in STATS_KEYS},
+        }
+        self.pending["generations"].append(self.with_partition(
+            pa.table(columns, schema=GENERATIONS_SCHEMA), partition))
+
+        populations = result.get("populations")
+        if self.include_populations and populations is not None and len(populations):
+            generations = result.get("population_generations", np.arange(len(populations)))
+            pops = np.asarray(populations, dtype=np.float64)
+            values = pa.array(pops.ravel())
+            offsets = pa.array(np.arange(0, pops.size + 1, pops.shape[1], dtype=np.int64))
+            self.pending["populations"].append(self.with_partition(pa.table({
+                "run_id": pa.array([run_id] * len(pops), pa.string()),
+                "generation": pa.array(np.asarray(generations, dtype=np.int32)),
+                "population": pa.LargeListArray.from_arrays(offsets, values),
+            }, schema=POPULATIONS_SCHEMA), partition))
+
+        self.n_pending += 1
+        if self.n_pending >= self.rows_per_flush:
+            self.flush()
+        return run_id
+
+    def with_partition(self, table, partition):
+        # las columnas de partición se guardan en la ruta, no en los archivos
+        for key, value in partition.items():
+            table = table.append_column(PARAMS_SCHEMA.field(key), pa.array([value] * len(table), PARAMS_SCHEMA.field(key).type))
+        return table
+
+    def flush(self):
+        partitioning = ds.partitioning(
+            pa.schema([PARAMS_SCHEMA.field(key) for key in self.partition_by]), flavor="hive")
+        ext = "parquet" if self.file_format == "parquet" else "arrow"
+        for name, tables in self.pending.items():
+            if not tables:
+                continue
+            ds.write_dataset(
+                pa.concat_tables(tables), self.root / name, format=FORMATS[self.file_format],
+                partitioning=partitioning, basename_template=f"part-{uuid.uuid4().hex}-{{i}}.{ext}",
+                existing_data_behavior="overwrite_or_ignore")
+            tables.clear()
+        self.n_pending = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_dataset(root, table="runs"):
+    """
+    pyarrow.dataset.Dataset perezoso sobre una tabla exportada: filtros y
+    proyecciones se aplican al leer, archivo a archivo. Los archivos se
+    abren con memoria mapeada.
+    """
+    if table not in TABLES:
+        raise ValueError(f"Tabla desconocida: {table}")
+    root = Path(root)
+    info = json.loads((root / "dataset.json").read_text())
+    schema = TABLES[table]
+    if table != "runs":
+        schema = pa.schema([*schema, *[PARAMS_SCHEMA.field(key) for key in info["partition_by"]]])
+    partitioning = ds.partitioning(
+        pa.schema([PARAMS_SCHEMA.field(key) for key in info["partition_by"]]), flavor="hive")
+    path = root / table
+    if not path.exists():
+        return ds.dataset([], schema=schema, format=FORMATS[info["format"]])
+    return ds.dataset(str(path), schema=schema, format=FORMATS[info["format"]], partitioning=partitioning,
+                      filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True))
+
+def read_table(root, table="runs", columns=None, filter=None):
+    """Lee una tabla exportada (solo las columnas y filas pedidas) como pyarrow.Table."""
+    return open_dataset(root, table).to_table(columns=columns, filter=filter)
@@ -0,0 +1,169 @@
+import tempfile
+
+import numpy as np
+
+from taller2ag import STATS_KEYS
+
+# Registradores compactos del historial de genetic_algorithm. Todos comparten
+# la interfaz de taller2ag.ListHistory: start(max_generations, len_poblation),
+# record(record) por generación, result() con las claves 'history',
+# 'populations', 'bests' y 'stats' del dict devuelto y nbytes().
+
+class SummaryHistory:
+    """
+    Solo guarda (pm, pc), el mejor y las estadísticas por generación; no
+    guarda poblaciones.
+    """
+    def start(self, max_generations, len_poblation):
+        self.history = np.empty((max_generations, 2), dtype=np.float64)
+        self.bests = np.empty(max_generations + 1, dtype=np.float64)
+        self.stats = np.empty((len(STATS_KEYS), max_generations + 1), dtype=np.float64)
+        self.n = 0
+
+    def record(self, record):
+        gen = record["generation"]
+        self.bests[gen] = record["best"]
+        self.stats[:, gen] = [record[key] for key in STATS_KEYS]
+        if record["pm"] is not None:
+            self.history[gen] = (record["pm"], record["pc"])
+        self.n = gen + 1
+
+    def result(self):
+        return {
+            "history": self.history[:max(self.n - 1, 0)],
+            "populations": None,
+            "bests": self.bests[:self.n],
+            "stats": {key: self.stats[i, :self.n] for i, key in enumerate(STATS_KEYS)}
+        }
+
+    def nbytes(self):
+        return self.history.nbytes + self.bests.nbytes + self.stats.nbytes
+
+class ArrayHistory(SummaryHistory):
+    """
+    Poblaciones en un array contiguo preasignado de forma
+    (generaciones guardadas, len_poblation). Con every=k solo se guarda cada
+    k-ésima generación (y siempre la última). dtype es el de las
+    poblaciones; el resumen por generación siempre es float64.
+    """
+    def __init__(self, dtype="float64", every=1):
+        self.dtype = np.dtype(dtype)
+        self.every = every
+
+    def allocate(self, shape):
+        return np.empty(shape, dtype=self.dtype)
+
+    def start(self, max_generations, len_poblation):
+        super().start(max_generations, len_poblation)
+        rows = max_generations // self.every + 1
+        if max_generations % self.every:
+            rows += 1
+        self.populations = self.allocate((rows, len_poblation))
+        self.generations = np.empty(rows, dtype=np.int64)
+        self.rows = 0
+
+    def record(self, record):
+        super().record(record)
+        gen = record["generation"]
+        if gen % self.every == 0 or record["stop_reason"] is not None:
+            self.populations[self.rows] = record["population"]
+            self.generations[self.rows] = gen
+            self.rows += 1
+
+    def result(self):
+        result = super().result()
+        result["populations"] = self.populations[:self.rows]
+        result["population_generations"] = self.generations[:self.rows]
+        return result
+
+    def nbytes(self):
+        return super().nbytes() + self.populations.nbytes + self.generations.nbytes
+
+class DownsampledHistory(ArrayHistory):
+    """ArrayHistory que guarda una de cada 'every' generaciones."""
+    def __init__(self, every=10, dtype="float64"):
+        super().__init__(dtype, every)
+
+class MemmapHistory(ArrayHistory):
+    """
+    ArrayHistory respaldado por un numpy.memmap en disco, para corridas
+    cuyo historial no cabe en memoria. Si no se da path se crea un archivo
+    temporal; la ruta queda en result()['history_path'].
+    """
+    def __init__(self, path=None, dtype="float32", every=1):
+        super().__init__(dtype, every)
+        self.path = path
+
+    def allocate(self, shape):
+        if self.path is None:
+            with tempfile.NamedTemporaryFile(prefix="ga_history_", suffix=".dat", delete=False) as f:
+                self.path = f.name
+        return np.memmap(self.path, dtype=self.dtype, mode="w+", shape=shape)
+
+    def __getstate__(self):
+        # en un punto de control solo se guarda la ruta; los datos ya están en disco
+        self.populations.flush()
+        state = self.__dict__.copy()
+        state["populations"] = self.populations.shape
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.populations = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=state["populations"])
+
+    def result(self):
+        self.populations.flush()
+        result = super().result()
+        result["history_path"] = self.path
+        return result
+
+RECORDERS = {
+    "summary": SummaryHistory,
+    "array": ArrayHistory,
+    "downsample": DownsampledHistory,
+    "memmap": MemmapHistory,
+}
+
+# --- Vistas reducidas para graficar ---
+
+def envelope(values, max_points=500):
+    """
+    Reduce una serie a como mucho max_points cubetas consecutivas. Devuelve
+    un dict con 'x' (índice inicial de cada cubeta), 'mean', 'min' y 'max'.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return {"x": np.arange(0), "mean": values, "min": values, "max": values}
+    size = max(1, -(-n // max_points))
+    starts = np.arange(0, n, size)
+    return {
+        "x": starts,
+        "mean": np.add.reduceat(values, starts) / np.diff(np.append(starts, n)),
+        "min": np.minimum.reduceat(values, starts),
+        "max": np.maximum.reduceat(values, starts),
+    }
+
+def population_histograms(populations, bins=40, value_range=None):
+    """
+    Histograma de cada población (filas de populations) con bins comunes.
+    Devuelve (counts de forma (poblaciones, bins), bordes de los bins).
+    """
+    pops = np.asarray(populations, dtype=np.float64)
+    lo, hi = value_range if value_range is not None else (pops.min(), pops.max())
+    if hi <= lo:
+        hi = lo + 1.0
+    idx = np.clip(((pops - lo) * (bins / (hi - lo))).astype(np.int64), 0, bins - 1)
+    rows = np.arange(len(pops))[:, None] * bins
+    counts = np.bincount((rows + idx).ravel(), minlength=len(pops) * bins).reshape(len(pops), bins)
+    return counts, np.linspace(lo, hi, bins + 1)
+
+def history_as_lists(result):
+    """Convierte el historial de un resultado al formato de listas original."""
+    populations = result["populations"]
+    return {
+        "history": [tuple(map(float, h)) for h in result["history"]],
+        "populations": [] if populations is None else [list(map(float, p)) for p in populations],
+        "bests": [float(b) for b in result["bests"]],
+        "stats": {key: [float(v) for v in values] for key, values in result["stats"].items()}
+    }
@@ -0,0 +1,163 @@
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+
+import numpy as np
+
+from ga_sweep import spawn_seeds
+from taller2ag import genetic_algorithm
+
+# Modelo de islas: cada subpoblación evoluciona en su propio proceso con
+# genetic_algorithm (y su propio pm/pc adaptativo). Cada migration_interval
+# generaciones las islas publican sus n_migrants mejores individuos en un
+# buffer de memoria compartida y reciben los de sus vecinas según la
+# topología; solo viajan esos pocos floats, nunca poblaciones completas.
+
+TOPOLOGIES = ("ring", "full")
+POLL_INTERVAL = 0.5  # segundos entre comprobaciones de procesos caídos
+
+def neighbours(island, n_islands, topology):
+    """Islas de las que 'island' recibe inmigrantes."""
+    if topology == "ring":
+        return [(island - 1) % n_islands] if n_islands > 1 else []
+    if topology == "full":
+        return [j for j in range(n_islands) if j != island]
+    raise ValueError(f"Topología desconocida: {topology}")
+
+class Migration:
+    """Callback de migración para iter_generations (una instancia por isla)."""
+    def __init__(self, island, n_islands, migrants, barrier, migration_interval, topology):
+        self.island = island
+        self.sources = neighbours(island, n_islands, topology)
+        self.migrants = migrants  # vista (n_islands, n_migrants) sobre la memoria compartida
+        self.barrier = barrier
+        self.migration_interval = migration_interval
+
+    def __call__(self, gen, poblacion, target):
+        if gen == 0 or gen % self.migration_interval or not self.sources:
+            return poblacion
+        pop = np.array(poblacion, dtype=np.float64)
+        order = np.argsort(np.abs(pop - target), kind="stable")
+        k = self.migrants.shape[1]
+        self.migrants[self.island] = pop[order[:k]]
+        self.barrier.wait()  # todas las islas han publicado
+        incoming = self.migrants[self.sources].ravel()
+        incoming = incoming[np.argsort(np.abs(incoming - target), kind="stable")[:k]]
+        self.barrier.wait()  # todas las islas han leído antes de la siguiente escritura
+        pop[order[len(pop) - len(incoming):]] = incoming
+        return pop if isinstance(poblacion, np.ndarray) else pop.tolist()
+
+def island_worker(island, n_islands, shm_names, shapes, barrier, queue, seed,
+                  migration_interval, topology, ga_kwargs):
+    migrants_shm, bests_shm = SharedMemory(name=shm_names[0]), SharedMemory(name=shm_names[1])
+    try:
+        migrants = np.ndarray(shapes[0], dtype=np.float64, buffer=migrants_shm.buf)
+        bests = np.ndarray(shapes[1], dtype=np.float64, buffer=bests_shm.buf)
+        migration = Migration(island, n_islands, migrants, barrier, migration_interval, topology)
+        result = genetic_algorithm(seed=seed, recorder="summary", migration=migration, **ga_kwargs)
+        bests[island, :len(result["bests"])] = result["bests"]
+        queue.put((island, {
+            "seed": seed,
+            "target": result["target"],
+            "best": float(result["best"]),
+            "fitness": float(result["fitness"]),
+            "history": np.asarray(result["history"]),
+        }))
+    except BaseException:
+        barrier.abort()  # desbloquea a las demás islas
+        queue.put((island, None))
+        raise
+    finally:
+        migrants_shm.close()
+        bests_shm.close()
+
+def run_islands(
+    max_generations:int,
+    latitude:float,
+    season:str,
+    n_islands:int=4,
+    migration_interval:int=10,
+    n_migrants:int=2,
+    topology:str="ring",
+    seed:int=None,
+    **ga_kwargs
+    ) -> dict:
+    """
+    Ejecuta n_islands instancias de genetic_algorithm en procesos separados
+    con migración periódica. ga_kwargs se pasan a cada isla (tamaño de
+    población, operadores, motor...); los criterios de parada anticipada no
+    se admiten porque todas las islas deben llegar a cada migración, y
+    fitness_mode debe ser "target" porque las islas y los migrantes se
+    comparan por |x - target|.
+
+    Devuelve un dict con:
+      'target', 'best', 'fitness': mejor individuo global,
+      'island_bests': array (n_islands, max_generations+1) con el mejor de cada isla,
+      'global_bests': array (max_generations+1,) con el mejor global por generación,
+      'islands': lista con el resumen de cada isla (seed, target, best, fitness, history)
+    """
+    stopping = {"tol_abs", "tol_rel", "patience", "min_diversity", "time_budget"} & set(ga_kwargs)
+    if stopping:
+        raise ValueError(f"El modelo de islas no admite parada anticipada: {sorted(stopping)}")
+    if ga_kwargs.get("fitness_mode", "target") != "target":
+        raise ValueError("El modelo de islas compara las islas por su target: solo admite fitness_mode='target'")
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topología desconocida: {topology}")
+    ga_kwargs = {"max_generations": max_generations, "latitude": latitude, "season": season, **ga_kwargs}
+
+    shapes = ((n_islands, n_migrants), (n_islands, max_generations + 1))
+    shms = [SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1)) for shape in shapes]
+    ctx = mp.get_context()
+    barrier = ctx.Barrier(n_islands)
+    queue = ctx.Queue()
+    procs = [
+        ctx.Process(target=island_worker,
+                    args=(i, n_islands, [shm.name for shm in shms], shapes, barrier, queue, island_seed,
+                          migration_interval, topology, ga_kwargs))
+        for i, island_seed in enumerate(spawn_seeds(n_islands, seed))
+    ]
+    try:
+        for proc in procs:
+            proc.start()
+        islands = [None] * n_islands
+        received = set()
+        while len(received) < n_islands:
+            try:
+                island, summary = queue.get(timeout=POLL_INTERVAL)
+            except Empty:
+                # un proceso terminado por una señal (p. ej. el OOM killer) no
+                # llega a avisar por la cola
+                killed = [i for i, proc in enumerate(procs) if i not in received and proc.exitcode not in (None, 0)]
+                if killed:
+                    barrier.abort()
+                    raise RuntimeError(f"Islas terminadas sin resultado: {killed} "
+                                       f"(código de salida {[procs[i].exitcode for i in killed]})") from None
+                continue
+            islands[island] = summary
+            received.add(island)
+        for proc in procs:
+            proc.join()
+        if any(summary is None for summary in islands):
+            raise RuntimeError("Una o más islas terminaron con error")
+        island_bests = np.ndarray(shapes[1], dtype=np.float64, buffer=shms[1].buf).copy()
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    target = islands[0]["target"]
+    errors = np.abs(island_bests - target)
+    winner = np.argmin(errors, axis=0)
+    global_bests = island_bests[winner, np.arange(island_bests.shape[1])]
+    best = float(global_bests[-1])
+    return {
+        "target": target,
+        "best": best,
+        "fitness": abs(best - target),
+        "island_bests": island_bests,
+        "global_bests": global_bests,
+        "islands": islands
+    }
@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+
+from ga_profiling import GAProfiler
+from taller2ag import genetic_algorithm
+
+# Ejecución de genetic_algorithm en segundo plano para la página de
+# Streamlit: un hilo por corrida que publica su progreso, se puede cancelar
+# y deja el resultado en una caché LRU acotada compartida entre sesiones.
+
+def params_key(params):
+    """Clave hashable de un dict de parámetros (las listas pasan a tuplas)."""
+    return tuple(sorted((key, tuple(value) if isinstance(value, list) else value)
+                        for key, value in params.items()))
+
+class ResultCache:
+    """Caché LRU de resultados con como mucho max_entries corridas."""
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class Cancelled(Exception):
+    pass
+
+class GAJob(threading.Thread):
+    """
+    Corre genetic_algorithm(**params) en un hilo. Mientras corre, generation
+    y best reflejan la última generación terminada; al acabar quedan
+    result (o error) y, si no hubo error ni cancelación, el resultado se
+    guarda en cache.
+    """
+    def __init__(self, params, cache=None):
+        super().__init__(daemon=True)
+        self.params = params
+        self.cache = cache
+        self.cancel_event = threading.Event()
+        self.generation = 0
+        self.best = None
+        self.result = None
+        self.error = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def on_generation(self, record):
+        self.generation = record["generation"]
+        self.best = record["best"]
+        if self.cancel_event.is_set():
+            raise Cancelled
+
+    def run(self):
+        profiler = GAProfiler(hooks={"generation_end": self.on_generation})
+        try:
+            self.result = genetic_algorithm(**self.params, profiler=profiler)
+        except Cancelled:
+            return
+        except Exception as e:
+            self.error = e
+            return
+        if self.cache is not None:
+            self.cache.put(params_key(self.params), self.result)
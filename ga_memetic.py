@@ -0,0 +1,102 @@
+import math
+
+# Etapa memética: búsqueda local determinista (sección dorada) sobre los
+# mejores individuos. Solo usa evaluaciones de la función objetivo, así que
+# sigue sirviendo si el fitness deja de ser |x - objetivo| y se vuelve caro.
+
+INV_PHI = (math.sqrt(5) - 1) / 2
+
+def golden_section_search(f, lo, hi, max_evals, x0=None, f0=None):
+    """
+    Minimiza f en [lo, hi] con como mucho max_evals evaluaciones. Devuelve
+    (x, f(x), evaluaciones); si se da (x0, f0) solo se devuelve otro punto
+    cuando mejora a x0.
+    """
+    best_x, best_f = x0, (math.inf if f0 is None else f0)
+    evals = 0
+    if max_evals < 2 or hi <= lo:
+        return best_x, best_f, evals
+    c = hi - INV_PHI * (hi - lo)
+    d = lo + INV_PHI * (hi - lo)
+    fc, fd = f(c), f(d)
+    evals = 2
+    while True:
+        for x, fx in ((c, fc), (d, fd)):
+            if fx < best_f:
+                best_x, best_f = x, fx
+        if evals >= max_evals:
+            break
+        if fc < fd:
+            hi, d, fd = d, c, fc
+            c = hi - INV_PHI * (hi - lo)
+            fc = f(c)
+        else:
+            lo, c, fc = c, d, fd
+            d = lo + INV_PHI * (hi - lo)
+            fd = f(d)
+        evals += 1
+    return best_x, best_f, evals
+
+class MemeticSearch:
+    """
+    Cada 'every' generaciones refina los top_k individuos con
+    golden_section_search en un intervalo de radio 2·pstdev alrededor de cada
+    uno (recortado a [valor_min, valor_max]). evals es el máximo de
+    evaluaciones por búsqueda y budget el total para toda la corrida.
+    """
+    def __init__(self, objective, valor_min, valor_max, every=10, top_k=1, evals=20, budget=None):
+        self.objective = objective
+        self.valor_min = valor_min
+        self.valor_max = valor_max
+        self.every = every
+        self.top_k = top_k
+        self.evals = evals
+        self.budget = budget
+        self.applications = 0
+        self.evaluations = 0
+        self.improvements = 0
+        self.gain = 0.0
+
+    def due(self, gen):
+        return gen % self.every == 0 and (self.budget is None or self.evaluations < self.budget)
+
+    def refine(self, poblation, ranked, stats):
+        """Mejora in situ los top_k de poblation; devuelve True si cambió alguno."""
+        radius = max(2 * stats["pstdev"], 1e-6 * (self.valor_max - self.valor_min))
+        changed = False
+        self.applications += 1
+        for idx in list(ranked.order[:self.top_k]):
+            max_evals = self.evals
+            if self.budget is not None:
+                max_evals = min(max_evals, self.budget - self.evaluations)
+            if max_evals < 2:
+                break
+            x0 = poblation[idx]
+            f0 = self.objective(x0)
+            lo = max(self.valor_min, x0 - radius)
+            hi = min(self.valor_max, x0 + radius)
+            x, fx, evals = golden_section_search(self.objective, lo, hi, max_evals - 1, x0, f0)
+            self.evaluations += evals + 1
+            if fx < f0:
+                poblation[idx] = x
+                self.improvements += 1
+                self.gain += f0 - fx
+                changed = True
+        return changed
+
+    def get_state(self):
+        return self.report()
+
+    def set_state(self, state):
+        self.applications = state["applications"]
+        self.evaluations = state["evaluations"]
+        self.improvements = state["improvements"]
+        self.gain = state["gain"]
+
+    def report(self):
+        return {
+            "applications": self.applications,
+            "evaluations": self.evaluations,
+            "improvements": self.improvements,
+            "gain": self.gain
+        }
@@ -0,0 +1,303 @@
+
+import numpy as np
+
+from solar_geometry import min_distance
+from taller2ag import OperatorPlan, diversity_probabilities, fresh_seed
+
+# Motor vectorizado del AG: la población es un ndarray float64 y cada
+# operador trabaja sobre la generación completa con un numpy.random.Generator.
+# Los operadores escalares de taller2ag siguen siendo la implementación de
+# referencia; aquí se replican con la misma distribución.
+
+# --- Funciones auxiliares ---
+
+def create_poblation(len_poblation, valor_min, valor_max, rng):
+    return rng.uniform(valor_min, valor_max, len_poblation)
+
+def fitness(poblation, target_distance):
+    return np.abs(poblation - target_distance)
+
+def tournament_cdf(len_poblation, sub_poblation_percentage=0.5):
+    """
+    Distribución del rango ganador de un torneo sin reemplazo de tamaño
+    int(len_poblation * sub_poblation_percentage), con al menos un
+    participante: cdf[m] = P(rango mínimo <= m).
+    """
+    len_sub = max(1, int(len_poblation * sub_poblation_percentage))
+    m = np.arange(len_poblation, dtype=np.float64)
+    ratios = np.clip((len_poblation - m - len_sub) / (len_poblation - m), 0.0, None)
+    survival = np.cumprod(ratios)  # P(rango mínimo > m)
+    return 1.0 - survival
+
+def rank_cdf(len_poblation, pressure=2.0):
+    """Ranking lineal: el mejor pesa 'pressure' y el peor 2 - pressure."""
+    r = np.arange(len_poblation, dtype=np.float64)
+    weights = (2 - pressure) + 2*(pressure - 1)*(len_poblation - 1 - r)/max(len_poblation - 1, 1)
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+def truncation_cdf(len_poblation, fraction=0.5):
+    top = max(1, int(len_poblation * fraction))
+    return np.minimum((np.arange(len_poblation) + 1) / top, 1.0)
+
+def rank_selection(order, cdf, n, rng):
+    """Devuelve n índices de la población muestreando rangos según cdf."""
+    ranks = np.searchsorted(cdf, rng.random(n), side="right")
+    return order[np.minimum(ranks, len(order) - 1)]
+
+# --- Cruces y mutaciones ---
+
+def arithmetic_crossover(p1, p2, alpha=None, rng=None):
+    if alpha is None: alpha = rng.random(p1.shape)
+    return (alpha*p1 + (1-alpha)*p2,
+            (1-alpha)*p1 + alpha*p2)
+
+def blx_alpha(p1, p2, alpha=0.3, rng=None):
+    lo, hi = np.minimum(p1, p2), np.maximum(p1, p2)
+    d = hi - lo
+    return (rng.uniform(lo - alpha*d, hi + alpha*d),
+            rng.uniform(lo - alpha*d, hi + alpha*d))
+
+def sbx(p1, p2, eta=2, rng=None):
+    u = rng.random(p1.shape)
+    with np.errstate(divide="ignore"):
+        beta = np.where(u <= 0.5,
+                        (2*u)**(1/(eta+1)),
+                        (1/(2*(1-u)))**(1/(eta+1)))
+    return (0.5*((1+beta)*p1 + (1-beta)*p2),
+            0.5*((1-beta)*p1 + (1+beta)*p2))
+
+def gaussian_mutation(D, D_min, D_max, sigma=500, rng=None):
+    Dp = D + rng.normal(0, sigma, D.shape)
+    return np.clip(Dp, D_min, D_max)
+
+def polynomial_mutation(D, D_min, D_max, eta_m=20, rng=None):
+    u = rng.random(D.shape)
+    delta = np.where(u < 0.5,
+                     (2*u)**(1/(1+eta_m)) - 1,
+                     1 - (2*(1-u))**(1/(1+eta_m)))
+    Dp = np.where(delta < 0, D + delta*(D - D_min), D + delta*(D_max - D))
+    return np.clip(Dp, D_min, D_max)
+
+# --- Métodos de adaptación ---
+
+def diversity_adaptation(poblation, pm_min, pm_max, pc_min, pc_max, k_m, k_c):
+    return diversity_probabilities(float(poblation.std()), pm_min, pm_max, pc_min, pc_max, k_m, k_c)
+
+def avg_fitness(poblation, target_distance):
+    return float(fitness(poblation, target_distance).mean())
+
+# --- Motor vectorizado ---
+
+class RankedArray:
+    """Fitness y orden de la población calculados una vez por generación."""
+    def __init__(self, poblation, target_distance, fitnesses=None):
+        self.poblation = poblation
+        self.fitnesses = fitness(poblation, target_distance) if fitnesses is None else fitnesses
+        self.order = np.argsort(self.fitnesses, kind="stable")
+
+    def best(self):
+        return float(self.poblation[self.order[0]])
+
+    def best_fitness(self):
+        return float(self.fitnesses[self.order[0]])
+
+def population_stats(poblation, fitnesses, target_distance):
+    """Mismas claves que taller2ag.PopulationStats, con reducciones de NumPy."""
+    d = poblation - target_distance
+    mean_d = d.mean()
+    return {
+        "mean": float(target_distance + mean_d),
+        "pstdev": float(np.sqrt(max(d @ d / len(d) - mean_d*mean_d, 0.0))),
+        "min": float(poblation.min()),
+        "max": float(poblation.max()),
+        "mean_fitness": float(fitnesses.mean())
+    }
+
+class NumpyEngine:
+    """
+    Motor con la misma interfaz que taller2ag.PythonEngine; cada generación
+    se produce con unas pocas operaciones sobre arrays.
+    """
+    def __init__(self, len_poblation, valor_min, valor_max,
+                 crossover_method="sbx", mutation_method="gaussian_mutation",
+                 crossover_param=None, mutation_param=None,
+                 selection_method="tournament", selection_param=None, seed=None, rng=None):
+        self.len_poblation = len_poblation
+        self.valor_min = valor_min
+        self.valor_max = valor_max
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.plan = OperatorPlan(crossover_method, mutation_method, selection_method,
+                                 crossover_param, mutation_param, selection_param,
+                                 valor_min, valor_max, batch=True, rng=self.rng)
+        self.cdf = self.plan.selection(len_poblation)
+        self._hijos = np.empty(2*((len_poblation + 1) // 2))
+        self.counts = None
+        self.objective = None
+
+    def create_poblation(self):
+        return create_poblation(self.len_poblation, self.valor_min, self.valor_max, self.rng)
+
+    def get_rng_state(self):
+        return self.rng.bit_generator.state
+
+    def set_rng_state(self, state):
+        self.rng.bit_generator.state = state
+
+    # las estadísticas se recalculan en cada generación: no hay sumas que guardar
+    def get_stats_state(self):
+        return None
+
+    def set_stats_state(self, poblation, target_distance, state):
+        pass
+
+    def rank(self, poblation, target_distance):
+        if self.objective is None:
+            return RankedArray(poblation, target_distance)
+        return RankedArray(poblation, target_distance, self.objective(poblation))
+
+    def stats(self, poblation, ranked, target_distance):
+        stats = population_stats(poblation, ranked.fitnesses, target_distance)
+        stats["best"] = ranked.best()
+        return stats
+
+    def empty_poblation(self):
+        return np.empty(self.len_poblation)
+
+    def breed(self, ranked, pm, pc, out, positions):
+        """Escribe un hijo en out[i] para cada i de positions (range o array de índices)."""
+        rng = self.rng
+        n = len(positions)
+        n_pairs = (n + 1) // 2
+        padres = ranked.poblation[rank_selection(ranked.order, self.cdf, 2*n_pairs, rng)]
+        p1, p2 = padres[0::2], padres[1::2]
+        cruza = rng.random(n_pairs) < pc
+        h1, h2 = self.plan.crossover(p1, p2)
+        hijos = self._hijos[:2*n_pairs]
+        hijos[0::2] = p1
+        hijos[1::2] = p2
+        np.copyto(hijos[0::2], h1, where=cruza)
+        np.copyto(hijos[1::2], h2, where=cruza)
+        muta = rng.random(2*n_pairs) < pm
+        np.copyto(hijos, self.plan.mutation(hijos), where=muta)
+        if isinstance(positions, range):
+            positions = slice(positions.start, positions.stop)
+        out[positions] = hijos[:n]
+        if self.counts is not None:
+            self.counts.update(selections=2*n_pairs, crossovers=int(cruza.sum()), mutations=int(muta.sum()))
+
+# --- Varios problemas a la vez ---
+
+def genetic_algorithm_batch(
+    max_generations:int,
+    latitude,
+    season,
+    len_poblation:int=10,
+    valor_min:float=0,
+    valor_max:float=10000,
+    panel_dimensions:list=[1476,659,35],
+    inclination_degree=45,
+    winter_solar_decline:float=-23.45,
+    summer_solar_decline:float=23.45,
+    adaptation_method:str="diversity",
+    pm_min:float=0.1, pm_max:float=0.4,
+    pc_min:float=0.3, pc_max:float=0.7,
+    k_m:float=0.035, k_c:float=0.08,
+    crossover_method:str="sbx",
+    mutation_method:str="gaussian_mutation",
+    crossover_param:float=None,
+    mutation_param:float=None,
+    selection_method:str="tournament",
+    selection_param:float=None,
+    seed:int=None,
+    rng=None
+    ) -> dict:
+    """
+    Evoluciona K problemas independientes en un único array (K, len_poblation).
+    latitude, season, inclination_degree y panel_dimensions aceptan un valor
+    o una secuencia de K valores (panel_dimensions: una lista de listas).
+    Cada fila tiene su propio pm/pc adaptativo. Todos los números
+    aleatorios salen de rng (numpy.random.Generator; por defecto uno nuevo
+    creado con seed, que si es None se toma de la entropía del sistema).
+
+    Devuelve un dict con arrays:
+      'target', 'best', 'fitness': forma (K,),
+      'history': (max_generations, K, 2) con (pm, pc),
+      'bests': (max_generations+1, K),
+      'population': población final (K, len_poblation),
+    y 'seed' (None si se pasó rng)
+    """
+    latitudes = np.atleast_1d(np.asarray(latitude, dtype=np.float64))
+    seasons = [season] if isinstance(season, str) else list(season)
+    inclinations = np.atleast_1d(np.asarray(inclination_degree, dtype=np.float64))
+    dims = np.asarray(panel_dimensions, dtype=np.float64).reshape(-1, 3)
+    K = max(len(latitudes), len(seasons), len(inclinations), len(dims))
+    latitudes = np.broadcast_to(latitudes, K)
+    seasons = seasons * K if len(seasons) == 1 else seasons
+    inclinations = np.broadcast_to(inclinations, K)
+    dims = np.broadcast_to(dims, (K, 3))
+    declines = [summer_solar_decline if s.lower() in ["verano","summer"] else winter_solar_decline for s in seasons]
+    target = min_distance(dims[:, 0], latitudes, inclinations, np.asarray(declines))
+    if np.isnan(target).any():
+        raise ValueError(f"El sol no supera el horizonte en las filas {np.flatnonzero(np.isnan(target)).tolist()}")
+
+    if rng is None:
+        seed = fresh_seed() if seed is None else seed
+        rng = np.random.default_rng(seed)
+    plan = OperatorPlan(crossover_method, mutation_method, selection_method,
+                        crossover_param, mutation_param, selection_param,
+                        valor_min, valor_max, batch=True, rng=rng)
+    n_pairs = (len_poblation + 1) // 2
+    cdf = plan.selection(len_poblation)
+
+    poblacion = rng.uniform(valor_min, valor_max, (K, len_poblation))
+    history = np.empty((max_generations, K, 2))
+    bests = np.empty((max_generations + 1, K))
+    rows = np.arange(K)[:, None]
+    fit_prev = None
+    for gen in range(max_generations + 1):
+        fit = np.abs(poblacion - target[:, None])
+        order = np.argsort(fit, axis=1, kind="stable")
+        bests[gen] = poblacion[rows[:, 0], order[:, 0]]
+        if gen == max_generations:
+            break
+
+        if adaptation_method=="diversity":
+            D = poblacion.std(axis=1)
+            pm = pm_min + (pm_max - pm_min)*np.exp(-k_m * D)
+            pc = pc_max - (pc_max - pc_min)*np.exp(-k_c * D)
+        else:
+            fit_curr = fit.mean(axis=1)
+            if fit_prev is None:
+                deltaF = np.zeros(K)
+            else:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    deltaF = np.where(fit_prev != 0, (fit_prev - fit_curr)/fit_prev, 0.0)
+            fit_prev = fit_curr
+            pm = pm_min + (pm_max - pm_min)*(1 - deltaF)
+            pc = pc_min + (pc_max - pc_min)*deltaF
+        history[gen, :, 0] = pm
+        history[gen, :, 1] = pc
+
+        ranks = np.minimum(np.searchsorted(cdf, rng.random((K, 2*n_pairs)), side="right"), len_poblation - 1)
+        padres = poblacion[rows, order[rows, ranks]]
+        p1, p2 = padres[:, 0::2], padres[:, 1::2]
+        cruza = rng.random((K, n_pairs)) < pc[:, None]
+        h1, h2 = plan.crossover(p1, p2)
+        hijos = np.empty((K, 2*n_pairs))
+        hijos[:, 0::2] = np.where(cruza, h1, p1)
+        hijos[:, 1::2] = np.where(cruza, h2, p2)
+        muta = rng.random((K, 2*n_pairs)) < pm[:, None]
+        hijos = np.where(muta, plan.mutation(hijos), hijos)
+        poblacion = hijos[:, :len_poblation]
+
+    best = bests[-1]
+    return {
+        "target": target,
+        "best": best,
+        "fitness": np.abs(best - target),
+        "history": history,
+        "bests": bests,
+        "population": poblacion,
+        "seed": seed
+    }
@@ -0,0 +1,90 @@
+import time
+from collections import defaultdict
+
+# Instrumentación opcional de genetic_algorithm / iter_generations. Si no se
+# pasa un profiler el bucle solo hace una comparación con None por fase.
+
+EVENTS = ("generation_start", "generation_end", "phase_start", "phase_end")
+
+class GAProfiler:
+    """
+    Temporizadores de alta resolución por fase ("rank", "stats",
+    "adaptation", "reproduction", "history"), contadores (evaluaciones de
+    fitness, cruces, mutaciones, bytes de historial...) y ganchos:
+
+      generation_start(gen), generation_end(record),
+      phase_start(phase, gen), phase_end(phase, gen, segundos)
+
+    Los ganchos se registran con on(evento, callback) o con el dict hooks.
+    """
+    def __init__(self, hooks=None):
+        self.hooks = {event: [] for event in EVENTS}
+        for event, callbacks in (hooks or {}).items():
+            for callback in (callbacks if isinstance(callbacks, (list, tuple)) else [callbacks]):
+                self.on(event, callback)
+        self.totals = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.generations = 0
+        self.gen = None
+        self._phase = None
+        self._t0 = None
+        self._run_start = None
+
+    def on(self, event, callback):
+        if event not in self.hooks:
+            raise ValueError(f"Evento desconocido: {event}")
+        self.hooks[event].append(callback)
+        return callback
+
+    def generation_start(self, gen):
+        if self._run_start is None:
+            self._run_start = time.perf_counter_ns()
+        self.gen = gen
+        for callback in self.hooks["generation_start"]:
+            callback(gen)
+
+    def generation_end(self, record):
+        self.generations += 1
+        for callback in self.hooks["generation_end"]:
+            callback(record)
+
+    def start(self, phase):
+        for callback in self.hooks["phase_start"]:
+            callback(phase, self.gen)
+        self._phase = phase
+        self._t0 = time.perf_counter_ns()
+
+    def stop(self):
+        elapsed = time.perf_counter_ns() - self._t0
+        phase = self._phase
+        self.totals[phase] += elapsed
+        self.calls[phase] += 1
+        for callback in self.hooks["phase_end"]:
+            callback(phase, self.gen, elapsed / 1e9)
+
+    def switch(self, phase):
+        """Cierra la fase en curso y abre la siguiente."""
+        self.stop()
+        self.start(phase)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def report(self):
+        total = (time.perf_counter_ns() - self._run_start) / 1e9 if self._run_start else 0.0
+        phases = {
+            phase: {
+                "total_s": ns / 1e9,
+                "calls": self.calls[phase],
+                "mean_s": ns / 1e9 / self.calls[phase],
+                "share": ns / 1e9 / total if total else 0.0
+            }
+            for phase, ns in self.totals.items()
+        }
+        return {
+            "total_s": total,
+            "generations": self.generations,
+            "phases": phases,
+            "counters": dict(self.counters)
+        }
@@ -0,0 +1,95 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from taller2ag import genetic_algorithm
+
+# Barrido de parámetros: ejecuta genetic_algorithm para muchas
+# configuraciones (latitud, temporada, inclinación, dimensiones del panel)
+# repartidas en un ProcessPoolExecutor.
+
+SWEEP_KEYS = ("latitude", "season", "inclination_degree", "panel_dimensions")
+
+def expand_grid(latitudes, seasons=("invierno",), inclinations=(45,), panel_dimensions=([1476,659,35],)):
+    """Producto cartesiano de los valores dados como lista de configuraciones."""
+    return [
+        {"latitude": lat, "season": season, "inclination_degree": incl, "panel_dimensions": list(dims)}
+        for lat, season, incl, dims in itertools.product(latitudes, seasons, inclinations, panel_dimensions)
+    ]
+
+def spawn_seeds(n, seed=None):
+    """
+    Una semilla independiente y reproducible por corrida (SeedSequence.spawn),
+    de 63 bits para que no se repitan entre muchas corridas y quepan en un int64.
+    """
+    import numpy as np
+    return [int(child.generate_state(1, np.uint64)[0] >> 1) for child in np.random.SeedSequence(seed).spawn(n)]
+
+def run_one(config, seed, ga_kwargs):
+    params = {**ga_kwargs, **config}
+    t0 = time.perf_counter()
+    result = genetic_algorithm(seed=seed, recorder="summary", **params)
+    wall_time = time.perf_counter() - t0
+    return {
+        "latitude": params["latitude"],
+        "season": params["season"],
+        "inclination_degree": params.get("inclination_degree", 45),
+        "panel_dimensions": list(params.get("panel_dimensions", [1476,659,35])),
+        "seed": seed,
+        "target": result["target"],
+        "best": float(result["best"]),
+        "fitness": float(result["fitness"]),
+        "generations": result["generations"],
+        "stop_reason": result["stop_reason"],
+        "wall_time": wall_time
+    }
+
+def run_chunk(chunk, ga_kwargs):
+    return [{"index": i, **run_one(config, seed, ga_kwargs)} for i, config, seed in chunk]
+
+def iter_sweep(configs, max_generations=50, max_workers=None, chunksize=None, seed=None, seeds=None, **ga_kwargs):
+    """
+    Genera filas de resultados a medida que los procesos terminan sus
+    bloques (el orden no es el de configs; cada fila trae su 'index').
+    ga_kwargs se pasan a todas las corridas y cada configuración puede
+    sobrescribirlos. seeds da una semilla explícita por configuración; si
+    no se da se derivan de seed con spawn_seeds.
+    """
+    configs = list(configs)
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(configs) // (max_workers * 4))
+    if seeds is None:
+        seeds = spawn_seeds(len(configs), seed)
+    tasks = list(zip(range(len(configs)), configs, seeds))
+    chunks = [tasks[i:i+chunksize] for i in range(0, len(tasks), chunksize)]
+    ga_kwargs = {"max_generations": max_generations, **ga_kwargs}
+
+    if max_workers == 1:
+        for chunk in chunks:
+            yield from run_chunk(chunk, ga_kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_chunk, chunk, ga_kwargs) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+def run_sweep(configs, max_generations=50, max_workers=None, chunksize=None, seed=None, as_arrow=False, **ga_kwargs):
+    """
+    Ejecuta el barrido completo y devuelve una tabla (pandas.DataFrame o,
+    con as_arrow=True, pyarrow.Table) ordenada como configs con columnas
+    latitude, season, inclination_degree, panel_dimensions, seed, target,
+    best, fitness, generations, stop_reason y wall_time.
+    """
+    rows = sorted(iter_sweep(configs, max_generations, max_workers, chunksize, seed, **ga_kwargs),
+                  key=lambda row: row["index"])
+    if as_arrow:
+        import pyarrow as pa
+        return pa.Table.from_pylist(rows)
+    import pandas as pd
+    return pd.DataFrame(rows).set_index("index")
@@ -0,0 +1,195 @@
+import inspect
+import json
+import math
+
+import numpy as np
+
+from ga_sweep import expand_grid, iter_sweep, spawn_seeds
+from taller2ag import get_operator, iter_generations
+
+# Ajuste automático de los parámetros de adaptación y de los operadores
+# para una clase de problemas (lista de instancias: latitud, temporada, ...)
+# por successive halving: se prueban muchas configuraciones con pocas
+# corridas y solo las mejores pasan a la siguiente ronda, con el triple de
+# corridas. Las corridas de cada ronda se reparten en un ProcessPoolExecutor
+# con ga_sweep.iter_sweep y todas las configuraciones usan las mismas
+# instancias y semillas, de modo que se comparan en condiciones idénticas.
+
+PRESET_VERSION = 1
+TUNABLE = ("pm_min", "pm_max", "pc_min", "pc_max", "k_m", "k_c", "crossover_param", "mutation_param")
+PRESET_KEYS = TUNABLE + ("crossover_method", "mutation_method", "selection_method", "adaptation_method")
+
+# rangos (mín, máx, logarítmico) de los parámetros de adaptación; los de los
+# operadores salen del registro (ver param_range)
+SEARCH_SPACE = {
+    "pm": (0.01, 0.9, False),
+    "pc": (0.05, 1.0, False),
+    "k_m": (0.001, 0.5, True),
+    "k_c": (0.001, 0.5, True),
+}
+
+def param_range(kind, method):
+    """(mín, máx, logarítmico) del parámetro del operador; None si no tiene."""
+    op = get_operator(kind, method)
+    if not op.params:
+        return None
+    schema = op.params[op.param_name]
+    lo, hi = schema["min"], schema["max"]
+    # rangos de varios órdenes de magnitud (σ, ηₘ): escala logarítmica desde max/1000
+    if hi >= 100:
+        return max(lo, hi / 1000), hi, True
+    return lo, hi, False
+
+def sample_value(rng, lo, hi, log):
+    if log:
+        return float(10 ** rng.uniform(math.log10(lo), math.log10(hi)))
+    return float(rng.uniform(lo, hi))
+
+def default_config(crossover_method="sbx", mutation_method="gaussian_mutation"):
+    """Valores por defecto de genetic_algorithm para TUNABLE."""
+    signature = inspect.signature(iter_generations).parameters
+    config = {key: signature[key].default for key in TUNABLE}
+    config["crossover_param"] = get_operator("crossover", crossover_method).default
+    config["mutation_param"] = get_operator("mutation", mutation_method).default
+    return config
+
+def sample_configs(n, rng, crossover_method="sbx", mutation_method="gaussian_mutation"):
+    """n configuraciones: la primera son los valores por defecto y el resto aleatorias."""
+    ranges = {"crossover_param": param_range("crossover", crossover_method),
+              "mutation_param": param_range("mutation", mutation_method)}
+    configs = [default_config(crossover_method, mutation_method)]
+    for _ in range(n - 1):
+        pm = sorted(sample_value(rng, *SEARCH_SPACE["pm"]) for _ in range(2))
+        pc = sorted(sample_value(rng, *SEARCH_SPACE["pc"]) for _ in range(2))
+        config = {"pm_min": pm[0], "pm_max": pm[1], "pc_min": pc[0], "pc_max": pc[1],
+                  "k_m": sample_value(rng, *SEARCH_SPACE["k_m"]),
+                  "k_c": sample_value(rng, *SEARCH_SPACE["k_c"])}
+        for key, bounds in ranges.items():
+            config[key] = None if bounds is None else sample_value(rng, *bounds)
+        configs.append(config)
+    return configs
+
+def bootstrap_ci(values, rng, level=0.95, n_boot=2000):
+    """Intervalo de confianza bootstrap (percentiles) de la media."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 2:
+        return float(values.mean()), float(values.mean())
+    means = values[rng.integers(0, len(values), (n_boot, len(values)))].mean(axis=1)
+    lo, hi = np.quantile(means, [(1 - level) / 2, (1 + level) / 2])
+    return float(lo), float(hi)
+
+def run_cost(row, max_generations, penalty):
+    """Generaciones hasta la tolerancia; penalty * max_generations si no se alcanzó (PAR-k)."""
+    return row["generations"] if row["stop_reason"] == "tolerance" else penalty * max_generations
+
+def summarize(config, rows, max_generations, penalty, rng, level):
+    cost = [run_cost(row, max_generations, penalty) for row in rows]
+    error = [row["fitness"] for row in rows]
+    return {
+        "params": config,
+        "runs": len(rows),
+        "success_rate": sum(row["stop_reason"] == "tolerance" for row in rows) / len(rows),
+        "cost": float(np.mean(cost)),
+        "cost_ci": bootstrap_ci(cost, rng, level),
+        "error": float(np.mean(error)),
+        "error_ci": bootstrap_ci(error, rng, level),
+        "wall_time": float(np.mean([row["wall_time"] for row in rows])),
+    }
+
+def tune(instances=None, n_candidates=27, eta=3, min_runs=4, max_runs=None, max_generations=100,
+         tol_abs=1.0, penalty=2.0, max_workers=None, seed=None, level=0.95, **ga_kwargs):
+    """
+    Busca pm_min/pm_max/pc_min/pc_max/k_m/k_c, crossover_param y
+    mutation_param para las instancias dadas (dicts con latitude, season,
+    ...; por defecto invierno y verano a 41°). ga_kwargs son argumentos
+    fijos de genetic_algorithm (p. ej. crossover_method, engine).
+
+    Cada corrida se puntúa por las generaciones hasta |mejor - target| <=
+    tol_abs, con penalty * max_generations si no llega, y por su error
+    final. En cada ronda las configuraciones vivas se evalúan con
+    min_runs * eta**ronda corridas (hasta max_runs); pasa la fracción 1/eta
+    con menor coste medio, salvo las que ya son claramente peores que la
+    mejor (intervalos de confianza sin solape). La última superviviente se
+    evalúa una ronda más.
+
+    Devuelve un dict con:
+      'best': resumen de la configuración elegida (params, runs,
+              success_rate, cost y error con su intervalo de confianza,
+              wall_time),
+      'baseline': resumen de los valores por defecto en la última ronda que alcanzaron,
+      'candidates': resúmenes de todas las configuraciones, de más a menos corridas,
+      'rungs': lista de (configuraciones, corridas) por ronda,
+      'preset': preset listo para save_preset
+    """
+    instances = list(instances or expand_grid((41,), ("invierno", "verano")))
+    rng = np.random.default_rng(seed)
+    crossover_method = ga_kwargs.get("crossover_method", "sbx")
+    mutation_method = ga_kwargs.get("mutation_method", "gaussian_mutation")
+    configs = sample_configs(n_candidates, rng, crossover_method, mutation_method)
+    if max_runs is None:
+        max_runs = min_runs * eta ** math.ceil(math.log(max(n_candidates, 2), eta))
+    seeds = spawn_seeds(max_runs, seed)
+    tasks = [(instances[t % len(instances)], seeds[t]) for t in range(max_runs)]
+    ga_kwargs = {**ga_kwargs, "tol_abs": tol_abs}
+
+    rows = {c: [] for c in range(n_candidates)}
+    summaries = {}
+    alive = list(range(n_candidates))
+    rungs = []
+    runs = min_runs
+    while True:
+        runs = min(runs, max_runs)
+        pending = [(c, t) for c in alive for t in range(len(rows[c]), runs)]
+        results = sorted(iter_sweep([{**tasks[t][0], **configs[c]} for c, t in pending], max_generations,
+                                    max_workers, seeds=[tasks[t][1] for c, t in pending], **ga_kwargs),
+                         key=lambda row: row["index"])
+        for (c, t), row in zip(pending, results):
+            rows[c].append(row)
+        for c in alive:
+            summaries[c] = summarize(configs[c], rows[c], max_generations, penalty, rng, level)
+        rungs.append((len(alive), runs))
+        if len(alive) == 1 or runs == max_runs:
+            break
+        alive.sort(key=lambda c: (summaries[c]["cost"], summaries[c]["error"]))
+        leader = summaries[alive[0]]
+        alive = [c for c in alive[:math.ceil(len(alive) / eta)]
+                 if summaries[c]["cost_ci"][0] <= leader["cost_ci"][1]]
+        runs *= eta
+
+    best = min(alive, key=lambda c: (summaries[c]["cost"], summaries[c]["error"]))
+    candidates = sorted(summaries.values(), key=lambda s: (-s["runs"], s["cost"], s["error"]))
+    problem = {"instances": instances, "max_generations": max_generations, "tol_abs": tol_abs, "penalty": penalty,
+               "crossover_method": crossover_method, "mutation_method": mutation_method,
+               **{key: value for key, value in ga_kwargs.items() if key != "tol_abs"}}
+    return {
+        "best": summaries[best],
+        "baseline": summaries[0],
+        "candidates": candidates,
+        "rungs": rungs,
+        "preset": make_preset(summaries[best], problem),
+    }
+
+# --- Presets ---
+
+def make_preset(summary, problem):
+    params = {**summary["params"], **{key: problem[key] for key in PRESET_KEYS if key in problem}}
+    score = {key: summary[key] for key in ("runs", "success_rate", "cost", "cost_ci", "error", "error_ci")}
+    return {"version": PRESET_VERSION, "params": params, "score": score, "problem": problem}
+
+def save_preset(path, preset):
+    with open(path, "w") as f:
+        json.dump(preset, f, indent=2)
+
+def load_preset(source):
+    """
+    Parámetros de genetic_algorithm de un preset guardado con save_preset;
+    source es una ruta o un archivo abierto (p. ej. el de st.file_uploader).
+    """
+    if hasattr(source, "read"):
+        preset = json.loads(source.read())
+    else:
+        with open(source) as f:
+            preset = json.load(f)
+    if preset.get("version") != PRESET_VERSION:
+        raise ValueError(f"Versión de preset no soportada: {preset.get('version')}")
+    return {key: value for key, value in preset["params"].items() if key in PRESET_KEYS}
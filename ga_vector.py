@@ -0,0 +1,156 @@
+import numpy as np
+
+from ga_numpy import rank_selection
+from taller2ag import OperatorPlan, StoppingCriteria, diversity_probabilities, fresh_seed, get_operator
+
+# AG con cromosomas vectoriales: la población es un array (len_poblation,
+# genes) con límites por gen. Los operadores por lotes de ga_numpy actúan gen
+# a gen sobre ese array (límites y parámetros se difunden por columnas), así
+# que el coste por generación son unas pocas operaciones sobre la población
+# completa más una evaluación del objetivo.
+
+VALUE_SCALE = 10000.0  # rango por defecto del AG escalar (mm)
+
+def diversity(poblation, lower, upper):
+    """
+    Desviación estándar media por gen, normalizada por el rango de cada gen
+    y expresada en la escala del AG escalar (0-10000) para que k_m y k_c
+    conserven su significado.
+    """
+    return float(np.mean(poblation.std(axis=0) / (upper - lower)) * VALUE_SCALE)
+
+def genetic_algorithm_vector(
+    objective,
+    max_generations:int,
+    lower=None,
+    upper=None,
+    len_poblation:int=50,
+    # adaptación
+    adaptation_method:str="diversity",      # "diversity" o "fitness"
+    pm_min:float=0.1, pm_max:float=0.4,
+    pc_min:float=0.3, pc_max:float=0.7,
+    k_m:float=0.035, k_c:float=0.08,
+    # operadores
+    crossover_method:str="sbx",
+    mutation_method:str="gaussian_mutation",
+    crossover_param:float=None,
+    mutation_param:float=None,
+    selection_method:str="tournament",
+    selection_param:float=None,
+    elitism:int=1,
+    # ejecución
+    seed:int=None,
+    rng=None,
+    patience:int=None,
+    time_budget:float=None,
+    include_populations:bool=False
+    ) -> dict:
+    """
+    Minimiza objective(poblacion) -> fitness por individuo, con poblacion de
+    forma (len_poblation, genes). lower/upper son los límites por gen (por
+    defecto objective.lower / objective.upper, p. ej.
+    solar_geometry.SpacingTiltObjective). Si el objetivo tiene repair(pob)
+    se aplica a cada población nueva para imponer restricciones.
+
+    Con mutation_method="gaussian_mutation", σ se da en la escala del AG
+    escalar (mm sobre 0-10000) y se reescala al rango de cada gen. La
+    mutación se decide gen a gen con probabilidad pm y los hijos se
+    recortan a los límites. Los números aleatorios salen de rng
+    (numpy.random.Generator; por defecto uno nuevo creado con seed, que si
+    es None se toma de la entropía del sistema).
+
+    Devuelve un dict con:
+      'best': mejor cromosoma (genes,), 'fitness': su fitness,
+      'decoded': objective.decode(best) si el objetivo lo define,
+      'history': array (generaciones, 2) con (pm, pc),
+      'bests': array (generaciones+1, genes) con el mejor por generación,
+      'stats': dict con arrays 'best_fitness', 'mean_fitness' y 'diversity',
+      'generations', 'stop_reason' (ver taller2ag.iter_generations),
+      'seed': semilla de la corrida (None si se pasó rng),
+      'populations': array (generaciones+1, len_poblation, genes) (solo con include_populations)
+    """
+    lower = np.asarray(objective.lower if lower is None else lower, dtype=np.float64)
+    upper = np.asarray(objective.upper if upper is None else upper, dtype=np.float64)
+    G = len(lower)
+    if rng is None:
+        seed = fresh_seed() if seed is None else seed
+        rng = np.random.default_rng(seed)
+    if get_operator("mutation", mutation_method).param_name == "sigma":
+        sigma = get_operator("mutation", mutation_method).default if mutation_param is None else mutation_param
+        mutation_param = sigma * (upper - lower) / VALUE_SCALE
+    plan = OperatorPlan(crossover_method, mutation_method, selection_method,
+                        crossover_param, mutation_param, selection_param,
+                        lower, upper, batch=True, rng=rng)
+    cdf = plan.selection(len_poblation)
+    repair = getattr(objective, "repair", None)
+    criteria = StoppingCriteria(patience=patience, time_budget=time_budget)
+    elitism = min(elitism, len_poblation)
+    n_children = len_poblation - elitism
+    n_pairs = (n_children + 1) // 2
+
+    poblacion = rng.uniform(lower, upper, (len_poblation, G))
+    if repair is not None:
+        poblacion = repair(poblacion)
+    history = np.empty((max_generations, 2))
+    bests = np.empty((max_generations + 1, G))
+    stats = {key: np.empty(max_generations + 1) for key in ("best_fitness", "mean_fitness", "diversity")}
+    populations = np.empty((max_generations + 1, len_poblation, G)) if include_populations else None
+    fit_prev = None
+    for gen in range(max_generations + 1):
+        fit = objective(poblacion)
+        order = np.argsort(fit, kind="stable")
+        bests[gen] = poblacion[order[0]]
+        stats["best_fitness"][gen] = fit[order[0]]
+        stats["mean_fitness"][gen] = fit.mean()
+        stats["diversity"][gen] = diversity(poblacion, lower, upper)
+        if populations is not None:
+            populations[gen] = poblacion
+        stop_reason = "max_generations" if gen == max_generations else criteria.check(
+            {"pstdev": stats["diversity"][gen]}, stats["best_fitness"][gen], 0.0)
+        if stop_reason is not None:
+            break
+
+        if adaptation_method == "diversity":
+            pm, pc = diversity_probabilities(stats["diversity"][gen], pm_min, pm_max, pc_min, pc_max, k_m, k_c)
+        else:
+            # como fitness_probabilities, pero el fitness puede ser negativo:
+            # la mejora relativa se mide sobre su magnitud
+            fit_curr = stats["mean_fitness"][gen]
+            deltaF = (fit_prev - fit_curr)/abs(fit_prev) if fit_prev else 0
+            pm = pm_min + (pm_max - pm_min)*(1 - deltaF)
+            pc = pc_min + (pc_max - pc_min)*deltaF
+            fit_prev = fit_curr
+        history[gen] = (pm, pc)
+
+        padres = poblacion[rank_selection(order, cdf, 2*n_pairs, rng)]
+        p1, p2 = padres[0::2], padres[1::2]
+        cruza = (rng.random(n_pairs) < pc)[:, None]
+        h1, h2 = plan.crossover(p1, p2)
+        hijos = np.empty((2*n_pairs, G))
+        hijos[0::2] = np.where(cruza, h1, p1)
+        hijos[1::2] = np.where(cruza, h2, p2)
+        muta = rng.random(hijos.shape) < pm
+        hijos = np.clip(np.where(muta, plan.mutation(hijos), hijos), lower, upper)
+
+        nueva = np.empty_like(poblacion)
+        nueva[:elitism] = poblacion[order[:elitism]]
+        nueva[elitism:] = hijos[:n_children]
+        poblacion = repair(nueva) if repair is not None else nueva
+
+    n = gen + 1
+    best = bests[gen]
+    result = {
+        "best": best,
+        "fitness": float(stats["best_fitness"][gen]),
+        "history": history[:gen],
+        "bests": bests[:n],
+        "stats": {key: values[:n] for key, values in stats.items()},
+        "generations": gen,
+        "stop_reason": stop_reason,
+        "seed": seed,
+    }
+    if hasattr(objective, "decode"):
+        result["decoded"] = objective.decode(best)
+    if populations is not None:
+        result["populations"] = populations[:n]
+    return result
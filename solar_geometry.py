@@ -0,0 +1,485 @@
+import os
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+
+# Geometría solar vectorizada. Las funciones aceptan escalares o ndarrays y
+# aplican broadcasting entre latitud, inclinación, declinación y longitud del
+# panel; taller2ag.min_distance es la versión escalar (con caché LRU).
+# También calcula tablas horarias de posición solar para todo un año y, con
+# ellas, el sombreado anual entre filas (ShadingObjective).
+
+def min_angle(latitude, solar_decline):
+    """Elevación solar crítica (°) al mediodía: 90 - φ + δ."""
+    return 90 - np.asarray(latitude, dtype=np.float64) + solar_decline
+
+def distance_factor(latitude, inclination_degree, solar_decline):
+    """
+    min_distance / B. Es NaN donde el sol no supera el horizonte
+    (elevación <= 0); con elevación >= 90° el sol queda detrás de la fila y
+    solo cuenta la proyección del panel (cos β).
+    """
+    alpha = np.radians(min_angle(latitude, solar_decline))
+    beta = np.radians(np.asarray(inclination_degree, dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shadow = np.where(alpha < np.pi/2, np.sin(beta) / np.tan(alpha), 0.0)
+    return np.where(alpha > 0, np.cos(beta) + shadow, np.nan)
+
+def min_distance(panel_length, latitude, inclination_degree, solar_decline):
+    """Versión vectorizada de taller2ag.min_distance (recibe B, no las dimensiones)."""
+    return np.asarray(panel_length, dtype=np.float64) * distance_factor(latitude, inclination_degree, solar_decline)
+
+class DistanceTable:
+    """
+    Tabla precalculada de min_distance / B sobre una malla latitud ×
+    inclinación para una declinación fija, con interpolación bilineal.
+    Se guarda y se carga con save/load (formato .npz).
+    """
+    def __init__(self, latitudes, inclinations, solar_decline, factors):
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.inclinations = np.asarray(inclinations, dtype=np.float64)
+        self.solar_decline = float(solar_decline)
+        self.factors = np.asarray(factors, dtype=np.float64)
+
+    @classmethod
+    def build(cls, solar_decline, latitudes=np.arange(0, 90.5, 0.5), inclinations=np.arange(0, 90.5, 0.5)):
+        lat, incl = np.meshgrid(latitudes, inclinations, indexing="ij")
+        return cls(latitudes, inclinations, solar_decline, distance_factor(lat, incl, solar_decline))
+
+    def save(self, path):
+        np.savez(path, latitudes=self.latitudes, inclinations=self.inclinations,
+                 solar_decline=self.solar_decline, factors=self.factors)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["latitudes"], data["inclinations"], data["solar_decline"], data["factors"])
+
+    @staticmethod
+    def _locate(grid, x):
+        x = np.clip(x, grid[0], grid[-1])
+        i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+        return i, (x - grid[i]) / (grid[i+1] - grid[i])
+
+    def __call__(self, panel_length, latitude, inclination_degree):
+        """
+        min_distance interpolada; fuera de la malla se satura en el borde.
+        Las celdas que tocan una elevación solar <= 0 devuelven NaN.
+        """
+        latitude, inclination_degree = np.broadcast_arrays(
+            np.asarray(latitude, dtype=np.float64), np.asarray(inclination_degree, dtype=np.float64))
+        i, u = self._locate(self.latitudes, latitude)
+        j, v = self._locate(self.inclinations, inclination_degree)
+        f = self.factors
+        factor = ((1-u)*(1-v)*f[i, j] + u*(1-v)*f[i+1, j]
+                  + (1-u)*v*f[i, j+1] + u*v*f[i+1, j+1])
+        return np.asarray(panel_length, dtype=np.float64) * factor
+
+# --- Posición solar a lo largo del año ---
+
+SUN_CACHE_DIR = os.path.join(tempfile.gettempdir(), "ga_sun_tables")
+
+def declination(day_of_year):
+    """Declinación solar (°) según Cooper: 23.45 sin(360 (284 + n) / 365)."""
+    return 23.45 * np.sin(np.radians(360 * (284 + np.asarray(day_of_year, dtype=np.float64)) / 365))
+
+def solar_position(latitude, day_of_year, hour):
+    """
+    Elevación y azimut solares (°) en hora solar. El azimut se mide desde la
+    dirección del ecuador (sur en el hemisferio norte, norte en el sur),
+    positivo hacia el oeste, de modo que las filas siempre miran a azimut 0.
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    # el ecuador se trata como hemisferio norte
+    sign = np.where(latitude < 0, -1.0, 1.0)
+    phi = np.radians(np.abs(latitude))
+    delta = np.radians(sign * declination(day_of_year))
+    omega = np.radians(15 * (np.asarray(hour, dtype=np.float64) - 12))
+    sin_alpha = np.sin(phi)*np.sin(delta) + np.cos(phi)*np.cos(delta)*np.cos(omega)
+    alpha = np.arcsin(np.clip(sin_alpha, -1, 1))
+    gamma = np.arctan2(np.sin(omega), np.cos(omega)*np.sin(phi) - np.tan(delta)*np.cos(phi))
+    return np.degrees(alpha), np.degrees(gamma)
+
+class SunTable:
+    """
+    Elevación y azimut solares de todo un año para una latitud, muestreados
+    cada step_minutes (solo los instantes con el sol sobre el horizonte).
+    weights son las horas que representa cada muestra.
+    """
+    def __init__(self, latitude, step_minutes, elevation, azimuth):
+        self.latitude = float(latitude)
+        self.step_minutes = int(step_minutes)
+        self.elevation = np.asarray(elevation, dtype=np.float64)
+        self.azimuth = np.asarray(azimuth, dtype=np.float64)
+        self.weights = np.full(len(self.elevation), self.step_minutes / 60)
+
+    @classmethod
+    def build(cls, latitude, step_minutes=60):
+        hours = (np.arange(0, 24*60, step_minutes) + step_minutes / 2) / 60
+        day, hour = np.meshgrid(np.arange(1, 366), hours, indexing="ij")
+        elevation, azimuth = solar_position(latitude, day.ravel(), hour.ravel())
+        up = elevation > 0
+        return cls(latitude, step_minutes, elevation[up], azimuth[up])
+
+    def save(self, path):
+        np.savez(path, latitude=self.latitude, step_minutes=self.step_minutes,
+                 elevation=self.elevation, azimuth=self.azimuth)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["latitude"], data["step_minutes"], data["elevation"], data["azimuth"])
+
+@lru_cache(maxsize=32)
+def sun_table(latitude, step_minutes=60, cache_dir=SUN_CACHE_DIR):
+    """
+    SunTable de la latitud dada, guardada en cache_dir con la latitud y la
+    resolución en el nombre; las siguientes llamadas (también desde otros
+    procesos) la cargan del disco. cache_dir=None desactiva el disco.
+    """
+    if cache_dir is None:
+        return SunTable.build(latitude, step_minutes)
+    path = os.path.join(cache_dir, f"sun_{float(latitude):+.4f}_{int(step_minutes)}min.npz")
+    if os.path.exists(path):
+        return SunTable.load(path)
+    table = SunTable.build(latitude, step_minutes)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    table.save(tmp)
+    os.replace(tmp, path)
+    return table
+
+# --- Sombreado anual entre filas ---
+
+SHADING_METRICS = ("shaded_hours", "lost_irradiance")
+
+def clear_sky_beam(elevation):
+    """Irradiancia directa normal de cielo despejado (W/m²), modelo de Meinel."""
+    air_mass = 1 / np.sin(np.radians(elevation))
+    return 1353 * 0.7 ** (air_mass ** 0.678)
+
+def tail_sums(keys, *values):
+    """
+    keys ordenadas y, para cada array de values, sus sumas de cola en ese
+    orden: tail[k] = suma de los valores con posición >= k (tail[-1] = 0).
+    """
+    order = np.argsort(keys, kind="stable")
+    return keys[order], [np.append(np.cumsum(v[order][::-1])[::-1], 0.0) for v in values]
+
+class ShadingObjective:
+    """
+    Fitness anual de una distancia entre filas D (mm), calculado para toda la
+    población a la vez:
+      "shaded_hours": horas al año en que la fila delantera sombrea a la trasera,
+      "lost_irradiance": irradiancia directa perdida por la fila trasera
+                         (kWh/m² al año, proporcional a la fracción sombreada),
+    más land_weight * D / 1000 por el terreno ocupado (unidades de la métrica
+    por metro). Solo cuentan los instantes en que el sol ilumina la cara
+    frontal de los paneles.
+    """
+    def __init__(self, latitude, panel_length, inclination_degree, metric="shaded_hours",
+                 land_weight=None, step_minutes=60, cache_dir=SUN_CACHE_DIR):
+        if metric not in SHADING_METRICS:
+            raise ValueError(f"Métrica de sombreado desconocida: {metric}")
+        table = sun_table(latitude, step_minutes, cache_dir)
+        alpha, gamma = np.radians(table.elevation), np.radians(table.azimuth)
+        beta = np.radians(inclination_degree)
+        B = float(panel_length)
+        cos_incidence = np.sin(alpha)*np.cos(beta) + np.cos(alpha)*np.sin(beta)*np.cos(gamma)
+        lit = (cos_incidence > 0) & (np.cos(gamma) > 0)
+        # ángulo de perfil: elevación aparente del sol en el plano perpendicular a las filas
+        tan_psi = np.tan(alpha[lit]) / np.cos(gamma[lit])
+        h, run = B*np.sin(beta), B*np.cos(beta)
+        denom = np.sin(beta) + np.cos(beta)*tan_psi
+        # fracción sombreada de la fila trasera: f(D) = clip(c0 - D·c1, 0, 1);
+        # hay sombra con D < hi y sombra total con D <= lo
+        c0 = (h + run*tan_psi) / denom / B
+        c1 = tan_psi / denom / B
+        weights = table.weights[lit]
+        if metric == "lost_irradiance":
+            weights = weights * clear_sky_beam(table.elevation[lit]) * cos_incidence[lit] / 1000
+        if land_weight is None:
+            land_weight = 100.0 if metric == "shaded_hours" else 10.0
+        self.metric = metric
+        self.panel_length = B
+        self.land_weight = land_weight
+        self.c0, self.c1, self.weights = c0, c1, weights
+        # Sumas acumuladas sobre los umbrales ordenados: cada evaluación es una
+        # búsqueda binaria en lugar de recorrer toda la tabla por individuo.
+        self._hi = tail_sums(c0 / c1, weights, weights*c0, weights*c1)
+        self._lo = tail_sums((c0 - 1) / c1, weights, weights*c0, weights*c1)
+
+    def shading(self, distances):
+        """Métrica de sombreado (sin el término de terreno) para cada distancia."""
+        D = np.asarray(distances, dtype=np.float64)
+        keys, (w_hi, a_hi, b_hi) = self._hi
+        i = np.searchsorted(keys, D, side="right")   # muestras con algo de sombra (hi > D)
+        if self.metric == "shaded_hours":
+            return w_hi[i]
+        keys, (w_lo, a_lo, b_lo) = self._lo
+        j = np.searchsorted(keys, D, side="left")    # muestras con sombra total (lo >= D)
+        return w_lo[j] + (a_hi[i] - a_lo[j]) - D*(b_hi[i] - b_lo[j])
+
+    def __call__(self, distances):
+        D = np.asarray(distances, dtype=np.float64)
+        return self.shading(D) + self.land_weight * D / 1000
+
+# --- Distancia e inclinación como variables ---
+
+def tilted_beam(elevation, azimuth, inclination_degree):
+    """
+    Irradiancia directa de cielo despejado (W/m²) sobre un plano inclinado
+    β que mira al ecuador; 0 cuando el sol ilumina la cara trasera.
+    """
+    alpha, gamma = np.radians(elevation), np.radians(azimuth)
+    beta = np.radians(inclination_degree)
+    cos_incidence = np.sin(alpha)*np.cos(beta) + np.cos(alpha)*np.sin(beta)*np.cos(gamma)
+    return clear_sky_beam(elevation) * np.maximum(cos_incidence, 0.0)
+
+def shaded_fraction(distance, inclination_degree, slope_length, elevation, azimuth):
+    """
+    Fracción de la fila trasera sombreada por la delantera, con la distancia
+    D medida entre los bordes inferiores de filas consecutivas (la misma que
+    min_distance). Admite broadcasting entre todos los argumentos.
+    """
+    alpha, gamma = np.radians(elevation), np.radians(azimuth)
+    beta = np.radians(inclination_degree)
+    cos_gamma = np.cos(gamma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tan_psi = np.where(cos_gamma > 0, np.tan(alpha) / cos_gamma, 0.0)
+        h, run = slope_length*np.sin(beta), slope_length*np.cos(beta)
+        t = (h - (distance - run)*tan_psi) / (np.sin(beta) + np.cos(beta)*tan_psi)
+        fraction = np.clip(t / slope_length, 0.0, 1.0)
+    return np.where((cos_gamma > 0) & (beta > 0), fraction, 0.0)
+
+GENE_BOUNDS = {"distance": (0.0, 10000.0), "inclination": (0.0, 90.0), "orientation": (0.0, 1.0)}
+
+class SpacingTiltObjective:
+    """
+    Objetivo para cromosomas vectoriales con los genes de 'genes' (columnas
+    de la población, en ese orden): "distance" (mm), "inclination" (β, °) y,
+    opcionalmente, "orientation" (< 0.5 vertical: el lado B sube por la
+    pendiente; >= 0.5 horizontal: sube el lado L). El gen que falte toma
+    inclination_degree o la orientación vertical.
+
+    fitness = land_weight · D / lado inclinado - energía neta, donde la
+    energía neta es la irradiación directa anual sobre el panel
+    (kWh/m²) menos la que pierde por la sombra de la fila anterior y
+    D / lado inclinado son los m² de terreno por m² de panel. Las filas que
+    se solapan (D menor que la proyección horizontal del panel) se
+    penalizan con OVERLAP_PENALTY por unidad de solape relativo.
+    """
+    OVERLAP_PENALTY = 1e4
+
+    def __init__(self, latitude, panel_dimensions=(1476, 659, 35), genes=("distance", "inclination"),
+                 bounds=None, inclination_degree=45, land_weight=100.0, step_minutes=60,
+                 cache_dir=SUN_CACHE_DIR):
+        unknown = set(genes) - set(GENE_BOUNDS)
+        if unknown or "distance" not in genes:
+            raise ValueError(f"Genes no válidos: {list(genes)} (se requiere 'distance'; opciones {list(GENE_BOUNDS)})")
+        bounds = {**GENE_BOUNDS, **(bounds or {})}
+        self.genes = tuple(genes)
+        self.lower = np.array([bounds[g][0] for g in self.genes], dtype=np.float64)
+        self.upper = np.array([bounds[g][1] for g in self.genes], dtype=np.float64)
+        self.panel_dimensions = tuple(panel_dimensions)
+        self.inclination_degree = inclination_degree
+        self.land_weight = land_weight
+        table = sun_table(latitude, step_minutes, cache_dir)
+        self.elevation, self.azimuth = table.elevation, table.azimuth
+        self.weights = table.weights / 1000  # W·h -> kWh
+        # términos que solo dependen del sol, calculados una vez
+        alpha, gamma = np.radians(self.elevation), np.radians(self.azimuth)
+        self._sin_a = np.sin(alpha)
+        self._cos_a_cos_g = np.cos(alpha) * np.cos(gamma)
+        self._front = np.cos(gamma) > 0
+        self._tan_psi = np.where(self._front, np.tan(alpha) / np.cos(gamma), 0.0)
+        self._beam = clear_sky_beam(self.elevation)
+
+    def columns(self, poblation):
+        """(D, β, lado inclinado) de cada individuo."""
+        pop = np.atleast_2d(poblation)
+        col = {g: pop[:, i] for i, g in enumerate(self.genes)}
+        beta = col.get("inclination", np.full(len(pop), float(self.inclination_degree)))
+        B, L = self.panel_dimensions[0], self.panel_dimensions[1]
+        slope = np.where(col["orientation"] >= 0.5, L, B) if "orientation" in col else np.full(len(pop), float(B))
+        return col["distance"], beta, slope
+
+    def net_energy(self, distance, beta, slope, chunk=2**21):
+        """Energía neta anual (kWh/m² de panel), por bloques para acotar la memoria."""
+        out = np.empty(len(distance))
+        step = max(1, chunk // max(len(self.weights), 1))
+        for i in range(0, len(distance), step):
+            s = slice(i, i + step)
+            b = np.radians(beta[s, None])
+            sin_b, cos_b = np.sin(b), np.cos(b)
+            d, l = distance[s, None], slope[s, None]
+            # mismas expresiones que tilted_beam y shaded_fraction
+            beam = self._beam * np.maximum(self._sin_a*cos_b + self._cos_a_cos_g*sin_b, 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = (l*sin_b - (d - l*cos_b)*self._tan_psi) / (sin_b + cos_b*self._tan_psi)
+            lost = np.where(self._front & (sin_b > 0), np.clip(t / l, 0.0, 1.0), 0.0)
+            out[s] = (beam * (1 - lost)) @ self.weights
+        return out
+
+    def __call__(self, poblation):
+        distance, beta, slope = self.columns(poblation)
+        overlap = np.maximum(slope*np.cos(np.radians(beta)) - distance, 0.0) / slope
+        return (self.land_weight * distance / slope - self.net_energy(distance, beta, slope)
+                + self.OVERLAP_PENALTY * overlap)
+
+    def decode(self, chromosome):
+        distance, beta, slope = self.columns(chromosome)
+        return {
+            "distance": float(distance[0]),
+            "inclination": float(beta[0]),
+            "orientation": "horizontal" if slope[0] != self.panel_dimensions[0] else "vertical",
+            "net_energy": float(self.net_energy(distance, beta, slope)[0]),
+        }
+
+# --- Campo de N filas ---
+
+def field_shaded_fraction(positions, heights, inclination_degree, slope_length, elevation, azimuth):
+    """
+    Fracción sombreada de cada fila de un campo con filas en positions (mm,
+    distancia horizontal desde la primera fila hacia el polo) y bases a
+    heights (mm) sobre el terreno, para cada instante de sol:
+    positions y heights (..., N) -> (..., N, T).
+
+    Cada fila delantera i proyecta sobre j la sombra de shaded_fraction con
+    la distancia efectiva D_ij + Δz_ij / tan ψ (ψ: ángulo de perfil). Todas
+    las sombras crecen desde el borde inferior, así que la de j es la de la
+    fila que la sombrea más, la de mayor x·tan ψ + z entre las anteriores:
+    un máximo acumulado sobre las filas en lugar de recorrer los pares.
+    """
+    x = np.asarray(positions, dtype=np.float64)[..., None]
+    z = np.asarray(heights, dtype=np.float64)[..., None]
+    alpha, gamma = np.radians(elevation), np.radians(azimuth)
+    cos_gamma = np.cos(gamma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tan_psi = np.where(cos_gamma > 0, np.tan(alpha) / cos_gamma, 0.0)
+        u = x*tan_psi + z
+        front = np.full_like(u[..., :1, :], -np.inf)
+        front = np.concatenate([front, np.maximum.accumulate(u, axis=-2)[..., :-1, :]], axis=-2)
+        distance = (u - front) / tan_psi
+        return shaded_fraction(distance, inclination_degree, slope_length, elevation, azimuth)
+
+class LayoutObjective:
+    """
+    Objetivo de ga_vector.genetic_algorithm_vector para un campo de n_rows
+    filas paralelas: el cromosoma son las n_rows - 1 separaciones (mm,
+    horizontales, entre bordes inferiores de filas consecutivas, como
+    min_distance). terrain_slope (°, escalar o una por separación) es la
+    pendiente del terreno entre cada fila y la siguiente, positiva si sube
+    hacia el polo. Todas las filas tienen la inclinación inclination_degree
+    y el lado B de panel_dimensions subiendo por la pendiente.
+
+    Restricción: la primera y la última fila caben en total_length (mm), es
+    decir, suma de separaciones + proyección del panel <= total_length;
+    repair() la impone. Cada separación es al menos la proyección del panel
+    (o min_spacing si es mayor).
+
+    fitness = -energía neta media por fila (kWh/m² de panel al año), con la
+    sombra de todas las filas delanteras (field_shaded_fraction).
+    """
+    def __init__(self, latitude, n_rows, total_length, terrain_slope=0.0, panel_dimensions=(1476, 659, 35),
+                 inclination_degree=45, min_spacing=None, step_minutes=60, cache_dir=SUN_CACHE_DIR, chunk=2**17):
+        if n_rows < 2:
+            raise ValueError("Se necesitan al menos 2 filas")
+        slopes = np.broadcast_to(np.asarray(terrain_slope, dtype=np.float64), (n_rows - 1,))
+        B = float(panel_dimensions[0])
+        beta = np.radians(inclination_degree)
+        run = B * np.cos(beta)
+        lo = max(run, min_spacing or 0.0)
+        budget = total_length - run
+        if budget < lo * (n_rows - 1):
+            raise ValueError(f"{n_rows} filas no caben en {total_length} mm (mínimo {lo*(n_rows-1) + run:.0f} mm)")
+        self.n_rows = n_rows
+        self.total_length = float(total_length)
+        self.terrain_slope = slopes.copy()
+        self.panel_dimensions = tuple(panel_dimensions)
+        self.inclination_degree = inclination_degree
+        self.budget = budget
+        self.chunk = chunk
+        self.lower = np.full(n_rows - 1, lo)
+        self.upper = np.full(n_rows - 1, budget - lo*(n_rows - 2))
+        self._rise = np.tan(np.radians(slopes))
+
+        # solo los instantes en que el sol ilumina la cara frontal
+        table = sun_table(latitude, step_minutes, cache_dir)
+        alpha, gamma = np.radians(table.elevation), np.radians(table.azimuth)
+        cos_incidence = np.sin(alpha)*np.cos(beta) + np.cos(alpha)*np.sin(beta)*np.cos(gamma)
+        lit = (cos_incidence > 0) & (np.cos(gamma) > 0)
+        self.elevation, self.azimuth = table.elevation[lit], table.azimuth[lit]
+        # kWh/m² de cada muestra sin sombra
+        self.energy = table.weights[lit] * clear_sky_beam(self.elevation) * cos_incidence[lit] / 1000
+        self.unshaded_energy = float(self.energy.sum())
+        # mismas expresiones que shaded_fraction con u = x·tan ψ + z:
+        # fracción = clip((a - (u_j - max u_i)) / c, 0, 1)
+        tan_psi = np.tan(alpha[lit]) / np.cos(gamma[lit])
+        c = (np.sin(beta) + np.cos(beta)*tan_psi) * B
+        self._tan_psi = tan_psi
+        self._a_c = (B*np.sin(beta) + run*tan_psi) / c
+        self._inv_c = 1 / c
+
+    def layout(self, spacings):
+        """(posiciones, alturas) de las filas (mm) para separaciones (..., n_rows - 1)."""
+        d = np.asarray(spacings, dtype=np.float64)
+        zeros = np.zeros(d.shape[:-1] + (1,))
+        positions = np.concatenate([zeros, np.cumsum(d, axis=-1)], axis=-1)
+        heights = np.concatenate([zeros, np.cumsum(d * self._rise, axis=-1)], axis=-1)
+        return positions, heights
+
+    def repair(self, poblation):
+        """Recorta el exceso sobre total_length en proporción a lo que cada separación supera el mínimo."""
+        pop = np.clip(poblation, self.lower, self.upper)
+        extra = pop - self.lower
+        excess = extra.sum(axis=1, keepdims=True)
+        room = self.budget - self.lower.sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(excess > room, room / excess, 1.0)
+        return self.lower + extra * scale
+
+    def shading(self, poblation):
+        """
+        Energía perdida por sombra en cada fila (kWh/m² al año):
+        (individuos, n_rows). El máximo acumulado de field_shaded_fraction se
+        recorre fila a fila sobre bloques (individuos × instantes) que caben
+        en caché, en lugar de materializar el array (individuos, filas,
+        instantes) completo.
+        """
+        pop = np.atleast_2d(poblation)
+        positions, heights = self.layout(pop)
+        out = np.zeros(positions.shape)
+        step = max(1, self.chunk // max(len(self.energy), 1))
+        for i in range(0, len(pop), step):
+            x, z = positions[i:i+step], heights[i:i+step]
+            front = x[:, :1]*self._tan_psi + z[:, :1]
+            u, t = np.empty_like(front), np.empty_like(front)
+            for j in range(1, self.n_rows):
+                np.multiply(x[:, j:j+1], self._tan_psi, out=u)
+                u += z[:, j:j+1]
+                np.subtract(front, u, out=t)
+                t *= self._inv_c
+                t += self._a_c
+                np.clip(t, 0.0, 1.0, out=t)
+                out[i:i+step, j] = t @ self.energy
+                np.maximum(front, u, out=front)
+        return out
+
+    def __call__(self, poblation):
+        return -(self.unshaded_energy - self.shading(poblation).mean(axis=1))
+
+    def decode(self, chromosome):
+        spacings = np.asarray(chromosome, dtype=np.float64)
+        positions, heights = self.layout(spacings)
+        lost = self.shading(spacings)[0]
+        return {
+            "spacings": spacings.tolist(),
+            "positions": positions.tolist(),
+            "heights": heights.tolist(),
+            "length": float(positions[-1] + self.panel_dimensions[0]*np.cos(np.radians(self.inclination_degree))),
+            "lost_energy": lost.tolist(),
+            "shading": (lost / self.unshaded_energy).tolist(),
+            "net_energy": float(self.unshaded_energy - lost.mean()),
+        }
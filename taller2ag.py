@@ -1,48 +1,151 @@
 import random
 import math
 import statistics
+import sys
+import time
+from bisect import bisect_right
+from functools import lru_cache, partial
+from importlib import import_module
 
 # --- Funciones auxiliares ---
 
-def create_individual(valor_min, valor_max):
-    return random.uniform(valor_min, valor_max)
+def create_individual(valor_min, valor_max, rng=random):
+    return rng.uniform(valor_min, valor_max)
 
-def create_poblation(len_poblation, valor_min, valor_max):
-    return [create_individual(valor_min, valor_max) for _ in range(len_poblation)]
+def create_poblation(len_poblation, valor_min, valor_max, rng=random):
+    return [create_individual(valor_min, valor_max, rng) for _ in range(len_poblation)]
+
+def fresh_seed():
+    """Semilla nueva de 63 bits (cabe en un int64) tomada de la entropía del sistema."""
+    return random.SystemRandom().getrandbits(63)
+
+def accepts(fn, name):
+    """True si la función (o método sin ligar) tiene un parámetro 'name'."""
+    code = getattr(getattr(fn, "__func__", fn), "__code__", None)
+    return code is not None and name in code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
 
 def min_angle(latitude, solar_decline):
     return 90 - latitude + solar_decline
 
 def min_distance(panel_dimensions, latitude, inclination_degree, solar_decline):
-    B = panel_dimensions[0]
+    return panel_min_distance(panel_dimensions[0], latitude, inclination_degree, solar_decline)
+
+@lru_cache(maxsize=4096)
+def panel_min_distance(B, latitude, inclination_degree, solar_decline):
+    """
+    Distancia mínima para un panel de longitud B. Si el sol no supera el
+    horizonte (elevación <= 0) no existe distancia que evite la sombra y se
+    lanza ValueError; con elevación >= 90° el sol queda detrás de la fila y
+    solo cuenta la proyección horizontal del panel. La versión vectorizada
+    está en solar_geometry.
+    """
+    alpha = min_angle(latitude, solar_decline)
+    if alpha <= 0:
+        raise ValueError(f"El sol no supera el horizonte (elevación {alpha:.2f}°) para latitud {latitude}°")
     beta = math.radians(inclination_degree)
-    alpha_min = math.radians(min_angle(latitude, solar_decline))
+    if alpha >= 90:
+        return B * math.cos(beta)
+    alpha_min = math.radians(alpha)
     return B * math.cos(beta) + (B * math.sin(beta)) / math.tan(alpha_min)
 
 def fitness(x, target_distance):
     return abs(x - target_distance)
 
-def ranking_selection(poblation, target_distance, sub_poblation_percentage):
-    len_sub = int(len(poblation) * sub_poblation_percentage)
-    idxs = random.sample(range(len(poblation)), len_sub)
+def ranking_selection(poblation, target_distance, sub_poblation_percentage, rng=random):
+    len_sub = max(1, int(len(poblation) * sub_poblation_percentage))
+    idxs = rng.sample(range(len(poblation)), len_sub)
     sub = [poblation[i] for i in idxs]
     return min(sub, key=lambda x: fitness(x, target_distance))
 
+# --- Selección por rangos ---
+
+@lru_cache(maxsize=32)
+def tournament_cdf(len_poblation, len_sub):
+    """
+    Distribución del rango del ganador de un torneo sin reemplazo de tamaño
+    len_sub (misma semántica que ranking_selection): cdf[m] = P(rango <= m).
+    """
+    cdf = []
+    survival = 1.0
+    for m in range(len_poblation):
+        survival *= max(len_poblation - m - len_sub, 0) / (len_poblation - m)
+        cdf.append(1.0 - survival)
+    return tuple(cdf)
+
+@lru_cache(maxsize=32)
+def rank_cdf(len_poblation, pressure):
+    """Ranking lineal: el mejor pesa 'pressure' y el peor 2 - pressure."""
+    n = len_poblation
+    weights = [(2 - pressure) + 2*(pressure - 1)*(n - 1 - r)/max(n - 1, 1) for r in range(n)]
+    total = sum(weights)
+    cdf = []
+    acc = 0.0
+    for w in weights:
+        acc += w
+        cdf.append(acc / total)
+    return tuple(cdf)
+
+class RankedPopulation:
+    """
+    Población ordenada por fitness una sola vez por generación. Cada
+    extracción de padres cuesta O(1) (truncamiento) u O(log n) (torneo, rango)
+    en lugar de reevaluar el fitness de media población. Los métodos de
+    selección devuelven un padre o, con k, una lista de k padres extraídos
+    de una vez.
+    """
+    def __init__(self, poblation, target_distance, fitnesses=None):
+        fits = fitnesses if fitnesses is not None else [fitness(x, target_distance) for x in poblation]
+        order = sorted(range(len(poblation)), key=fits.__getitem__)
+        self.order = order
+        self.ranked = [poblation[i] for i in order]
+        self.fitnesses = [fits[i] for i in order]
+
+    def best(self):
+        return self.ranked[0]
+
+    def best_fitness(self):
+        return self.fitnesses[0]
+
+    def draw(self, cdf, rng=random, k=None):
+        """Padre(s) con P(rango <= m) = cdf[m]."""
+        ranked, last = self.ranked, len(self.ranked) - 1
+        if k is None:
+            return ranked[min(bisect_right(cdf, rng.random()), last)]
+        rnd = rng.random
+        return [ranked[min(bisect_right(cdf, rnd()), last)] for _ in range(k)]
+
+    def tournament(self, sub_poblation_percentage=0.5, rng=random, k=None):
+        # al menos un participante, como en truncation: un torneo vacío
+        # daría una cdf nula y draw elegiría siempre al peor
+        n = len(self.ranked)
+        return self.draw(tournament_cdf(n, max(1, int(n * sub_poblation_percentage))), rng, k)
+
+    def rank(self, pressure=2.0, rng=random, k=None):
+        return self.draw(rank_cdf(len(self.ranked), pressure), rng, k)
+
+    def truncation(self, fraction=0.5, rng=random, k=None):
+        ranked = self.ranked
+        top = max(1, int(len(ranked) * fraction))
+        if k is None:
+            return ranked[int(rng.random() * top)]
+        rnd = rng.random
+        return [ranked[int(rnd() * top)] for _ in range(k)]
+
 # --- Cruces y mutaciones ---
 
-def arithmetic_crossover(p1, p2, alpha=None):
-    if alpha is None: alpha = random.random()
+def arithmetic_crossover(p1, p2, alpha=None, rng=random):
+    if alpha is None: alpha = rng.random()
     return (alpha*p1 + (1-alpha)*p2,
             (1-alpha)*p1 + alpha*p2)
 
-def blx_alpha(p1, p2, alpha=0.3):
+def blx_alpha(p1, p2, alpha=0.3, rng=random):
     lo, hi = min(p1,p2), max(p1,p2)
     d = hi - lo
-    return (random.uniform(lo - alpha*d, hi + alpha*d),
-            random.uniform(lo - alpha*d, hi + alpha*d))
+    return (rng.uniform(lo - alpha*d, hi + alpha*d),
+            rng.uniform(lo - alpha*d, hi + alpha*d))
 
-def sbx(p1, p2, eta=2):
-    u = random.random()
+def sbx(p1, p2, eta=2, rng=random):
+    u = rng.random()
     if u <= 0.5:
         beta = (2*u)**(1/(eta+1))
     else:
@@ -50,12 +153,12 @@ def sbx(p1, p2, eta=2):
     return (0.5*((1+beta)*p1 + (1-beta)*p2),
             0.5*((1-beta)*p1 + (1+beta)*p2))
 
-def gaussian_mutation(D, D_min, D_max, sigma=500):
-    Dp = D + random.gauss(0, sigma)
+def gaussian_mutation(D, D_min, D_max, sigma=500, rng=random):
+    Dp = D + rng.gauss(0, sigma)
     return min(max(Dp, D_min), D_max)
 
-def polynomial_mutation(D, D_min, D_max, eta_m=20):
-    u = random.random()
+def polynomial_mutation(D, D_min, D_max, eta_m=20, rng=random):
+    u = rng.random()
     if u < 0.5:
         delta = (2*u)**(1/(1+eta_m)) - 1
     else:
@@ -66,20 +169,435 @@ def polynomial_mutation(D, D_min, D_max, eta_m=20):
         Dp = D + delta*(D_max - D)
     return min(max(Dp, D_min), D_max)
 
+# --- Registro de operadores ---
+
+class Operator:
+    """
+    Operador registrado. scalar actúa sobre individuos (float) y batch sobre
+    arrays de NumPy con un argumento rng; batch puede ser la función o una
+    cadena "modulo:funcion" que se importa al resolverla. params describe los
+    parámetros: {nombre: {"default", "min", "max", "label"}}; el primero es
+    el que recibe crossover_param / mutation_param / selection_param.
+
+    Firmas esperadas:
+      crossover: scalar(p1, p2, param) -> (h1, h2); batch(p1, p2, param, rng=rng)
+      mutation:  scalar(D, D_min, D_max, param) -> D'; batch(D, D_min, D_max, param, rng=rng)
+      selection: scalar(ranked, param) -> individuo (ranked: RankedPopulation);
+                 batch(len_poblation, param) -> cdf sobre los rangos
+    Las implementaciones escalares pueden aceptar además rng (un
+    random.Random; si no, usan el módulo random) y las de selección k, para
+    devolver k individuos de una vez.
+    """
+    def __init__(self, kind, name, scalar=None, batch=None, params=None, label=None):
+        self.kind = kind
+        self.name = name
+        self.scalar = scalar
+        self.batch = batch
+        self.params = params or {}
+        self.label = label or name
+
+    @property
+    def param_name(self):
+        return next(iter(self.params), None)
+
+    @property
+    def default(self):
+        return self.params[self.param_name]["default"] if self.params else None
+
+    def implementation(self, batch=False):
+        fn = self.batch if batch else self.scalar
+        if fn is None:
+            raise ValueError(f"El operador {self.name} no tiene implementación {'batch' if batch else 'escalar'}")
+        if isinstance(fn, str):
+            module, attr = fn.split(":")
+            fn = getattr(import_module(module), attr)
+        return fn
+
+    def bind(self, value=None, batch=False, **fixed):
+        """Función con el parámetro (o su valor por defecto) ya ligado."""
+        kwargs = dict(fixed)
+        if self.params:
+            kwargs[self.param_name] = self.default if value is None else value
+        return partial(self.implementation(batch), **kwargs)
+
+OPERATORS = {"crossover": {}, "mutation": {}, "selection": {}}
+
+def register_operator(kind, name, scalar=None, batch=None, params=None, label=None):
+    """Registra (o reemplaza) un operador; ver Operator para las firmas."""
+    if kind not in OPERATORS:
+        raise ValueError(f"Tipo de operador desconocido: {kind}")
+    OPERATORS[kind][name] = Operator(kind, name, scalar, batch, params, label)
+    return OPERATORS[kind][name]
+
+def get_operator(kind, name):
+    try:
+        return OPERATORS[kind][name]
+    except KeyError:
+        raise ValueError(f"Operador de {kind} desconocido: {name}") from None
+
+register_operator("crossover", "arithmetic_crossover", arithmetic_crossover, "ga_numpy:arithmetic_crossover",
+                  {"alpha": {"default": None, "min": 0.0, "max": 1.0, "label": "α"}}, "Cruce aritmetico")
+register_operator("crossover", "blx_alpha", blx_alpha, "ga_numpy:blx_alpha",
+                  {"alpha": {"default": 0.3, "min": 0.0, "max": 1.0, "label": "α"}}, "blx_alpha")
+register_operator("crossover", "sbx", sbx, "ga_numpy:sbx",
+                  {"eta": {"default": 2, "min": 2.0, "max": 5.0, "label": "η"}}, "sbx")
+register_operator("mutation", "gaussian_mutation", gaussian_mutation, "ga_numpy:gaussian_mutation",
+                  {"sigma": {"default": 500, "min": 0.0, "max": 1000.0, "label": "σ"}}, "Mutación Gaussiana")
+register_operator("mutation", "polynomial_mutation", polynomial_mutation, "ga_numpy:polynomial_mutation",
+                  {"eta_m": {"default": 20, "min": 0.0, "max": 100.0, "label": "ηₘ"}}, "Mutación Polinómica")
+register_operator("selection", "tournament", RankedPopulation.tournament, "ga_numpy:tournament_cdf",
+                  {"sub_poblation_percentage": {"default": 0.5, "min": 0.01, "max": 1.0, "label": "fracción"}}, "Torneo")
+register_operator("selection", "rank", RankedPopulation.rank, "ga_numpy:rank_cdf",
+                  {"pressure": {"default": 2.0, "min": 1.0, "max": 2.0, "label": "presión"}}, "Ranking lineal")
+register_operator("selection", "truncation", RankedPopulation.truncation, "ga_numpy:truncation_cdf",
+                  {"fraction": {"default": 0.5, "min": 0.0, "max": 1.0, "label": "fracción"}}, "Truncamiento")
+
+class OperatorPlan:
+    """
+    Operadores de una corrida resueltos una sola vez antes del bucle:
+      crossover(p1, p2) -> (h1, h2), mutation(D) -> D',
+      selection: función ligada (scalar: select(ranked); batch: cdf(len_poblation)),
+      select_many(ranked, k) -> lista de k padres (solo escalar).
+    Con batch=True se usan las implementaciones vectorizadas con rng ligado;
+    las escalares reciben rng si lo aceptan.
+    """
+    def __init__(self, crossover_method="sbx", mutation_method="gaussian_mutation",
+                 selection_method="tournament", crossover_param=None, mutation_param=None,
+                 selection_param=None, valor_min=0, valor_max=10000, batch=False, rng=None):
+        ops = {kind: get_operator(kind, name) for kind, name in
+               (("crossover", crossover_method), ("mutation", mutation_method), ("selection", selection_method))}
+        fixed = {kind: {"rng": rng} if batch or (rng is not None and accepts(op.implementation(), "rng")) else {}
+                 for kind, op in ops.items()}
+        self.crossover = ops["crossover"].bind(crossover_param, batch, **fixed["crossover"])
+        self.mutation = partial(ops["mutation"].bind(mutation_param, batch, **fixed["mutation"]),
+                                D_min=valor_min, D_max=valor_max)
+        self.selection = ops["selection"].bind(selection_param, batch,
+                                               **({} if batch else fixed["selection"]))
+        self.bulk_selection = not batch and accepts(ops["selection"].implementation(), "k")
+
+    def select_many(self, ranked, k):
+        if self.bulk_selection:
+            return self.selection(ranked, k=k)
+        return [self.selection(ranked) for _ in range(k)]
+
+ADAPTATION_METHODS = {"diversity": "Por Diversidad", "fitness": "Por Fitness"}
+
 # --- Métodos de adaptación ---
 
-def diversity_adaptation(poblation, pm_min, pm_max, pc_min, pc_max, k_m, k_c):
-    D = statistics.pstdev(poblation)
+def diversity_probabilities(D, pm_min, pm_max, pc_min, pc_max, k_m, k_c):
     pm = pm_min + (pm_max - pm_min)*math.exp(-k_m * D)
     pc = pc_max - (pc_max - pc_min)*math.exp(-k_c * D)
     return pm, pc
 
+def diversity_adaptation(poblation, pm_min, pm_max, pc_min, pc_max, k_m, k_c):
+    D = statistics.pstdev(poblation)
+    return diversity_probabilities(D, pm_min, pm_max, pc_min, pc_max, k_m, k_c)
+
+def fitness_probabilities(fit_prev, fit_curr, pm_min, pm_max, pc_min, pc_max):
+    deltaF = (fit_prev - fit_curr)/fit_prev if fit_prev else 0
+    pm = pm_min + (pm_max - pm_min)*(1 - deltaF)
+    pc = pc_min + (pc_max - pc_min)*deltaF
+    return pm, pc
+
 def avg_fitness(poblation, target_distance):
     return sum(fitness(d, target_distance) for d in poblation) / len(poblation)
 
+# --- Estadísticas de población ---
+
+STATS_KEYS = ("mean", "pstdev", "min", "max", "mean_fitness", "best")
+
+class PopulationStats:
+    """
+    Media, desviación estándar poblacional, mínimo, máximo y fitness medio
+    calculados en una sola pasada (el mejor individuo lo da el ranking). Las
+    sumas se acumulan respecto a un individuo de la población (d = x - shift)
+    para que la cancelación de sumsq/n - media² sea pequeña aunque la
+    población converja lejos del objetivo; una población colapsada da
+    pstdev 0 exacto. update() reemplaza un individuo y actualiza las sumas en
+    O(1); mínimo y máximo se recalculan solo si el individuo reemplazado era
+    uno de ellos, y las sumas cuando la cota del error de redondeo acumulado
+    deja de ser despreciable frente a la varianza (no frente a sumsq, que
+    puede ser mucho mayor).
+    """
+    REL_TOL = 1e-10
+
+    def __init__(self, poblation, target_distance):
+        self.poblation = poblation
+        self.target = target_distance
+        self.n = len(poblation)
+        self._accumulate()
+
+    def _accumulate(self):
+        target, shift = self.target, self.poblation[0]
+        s = ss = sf = 0.0
+        lo = hi = shift
+        for x in self.poblation:
+            d = x - shift
+            s += d
+            ss += d*d
+            sf += abs(x - target)
+            if x < lo:
+                lo = x
+            elif x > hi:
+                hi = x
+        self.shift = shift
+        self.sum, self.sumsq, self.sum_fit = s, ss, sf
+        self.min, self.max = lo, hi
+        self.stale = False
+        # cotas del error de redondeo de las actualizaciones en sum y sumsq
+        self.err_sum = self.err_sumsq = 0.0
+
+    def update(self, index, value):
+        old = self.poblation[index]
+        self.poblation[index] = value
+        d_old, d_new = old - self.shift, value - self.shift
+        self.sum += d_new - d_old
+        self.sumsq += d_new*d_new - d_old*d_old
+        self.sum_fit += abs(value - self.target) - abs(old - self.target)
+        eps = sys.float_info.epsilon
+        self.err_sum += eps * (abs(d_old) + abs(d_new) + abs(self.sum))
+        self.err_sumsq += eps * (d_old*d_old + d_new*d_new + self.sumsq)
+        if old == self.min or old == self.max:
+            self.stale = True
+        elif not self.stale:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    STATE_KEYS = ("shift", "sum", "sumsq", "sum_fit", "min", "max", "stale", "err_sum", "err_sumsq")
+
+    def get_state(self):
+        return {key: getattr(self, key) for key in self.STATE_KEYS}
+
+    def set_state(self, state):
+        for key in self.STATE_KEYS:
+            setattr(self, key, state[key])
+
+    def variance_sum(self):
+        """sum((x - media)²) calculada con las sumas desplazadas."""
+        return max(self.sumsq - self.sum*self.sum / self.n, 0.0)
+
+    def as_dict(self):
+        if self.err_sumsq:
+            # error de sumsq - sum²/n: el de sumsq más 2|sum|/n veces el de sum
+            err = self.err_sumsq + 2*abs(self.sum) / self.n * self.err_sum
+            if err > self.REL_TOL * self.variance_sum():
+                self._accumulate()
+        if self.stale:
+            self.min, self.max = min(self.poblation), max(self.poblation)
+            self.stale = False
+        return {
+            "mean": self.shift + self.sum / self.n,
+            "pstdev": math.sqrt(self.variance_sum() / self.n),
+            "min": self.min,
+            "max": self.max,
+            "mean_fitness": self.sum_fit / self.n
+        }
+
+# --- Criterios de parada ---
+
+class StoppingCriteria:
+    """
+    Criterios de parada anticipada (None desactiva cada uno):
+      tol_abs: fitness del mejor <= tol_abs (mm),
+      tol_rel: fitness del mejor <= tol_rel * objetivo,
+      patience: generaciones seguidas sin mejorar el mejor fitness,
+      min_diversity: pstdev de la población por debajo del umbral,
+      time_budget: segundos de reloj desde el inicio de la corrida.
+    check() devuelve el motivo de parada o None.
+    """
+    def __init__(self, tol_abs=None, tol_rel=None, patience=None, min_diversity=None, time_budget=None):
+        self.tol_abs = tol_abs
+        self.tol_rel = tol_rel
+        self.patience = patience
+        self.min_diversity = min_diversity
+        self.time_budget = time_budget
+        self.start = time.perf_counter()
+        self.best_fitness = math.inf
+        self.stagnant = 0
+
+    def get_state(self):
+        return {"elapsed": time.perf_counter() - self.start,
+                "best_fitness": self.best_fitness, "stagnant": self.stagnant}
+
+    def set_state(self, state):
+        self.start = time.perf_counter() - state["elapsed"]
+        self.best_fitness = state["best_fitness"]
+        self.stagnant = state["stagnant"]
+
+    def check(self, stats, best_fitness, target_distance):
+        if best_fitness < self.best_fitness:
+            self.best_fitness = best_fitness
+            self.stagnant = 0
+        else:
+            self.stagnant += 1
+        if self.tol_abs is not None and best_fitness <= self.tol_abs:
+            return "tolerance"
+        if self.tol_rel is not None and best_fitness <= self.tol_rel * abs(target_distance):
+            return "tolerance"
+        if self.patience is not None and self.stagnant >= self.patience:
+            return "stagnation"
+        if self.min_diversity is not None and stats["pstdev"] < self.min_diversity:
+            return "diversity"
+        if self.time_budget is not None and time.perf_counter() - self.start >= self.time_budget:
+            return "time_budget"
+        return None
+
+# --- Motores de ejecución ---
+
+class PythonEngine:
+    """
+    Motor de referencia: la población es una lista de float y cada hijo se
+    genera con los operadores escalares de este módulo. Todos los números
+    aleatorios salen de rng (un random.Random propio, creado con seed si no
+    se da), así que varias corridas pueden compartir proceso o hilos.
+    """
+    def __init__(self, len_poblation, valor_min, valor_max,
+                 crossover_method="sbx", mutation_method="gaussian_mutation",
+                 crossover_param=None, mutation_param=None,
+                 selection_method="tournament", selection_param=None, seed=None, rng=None):
+        self.len_poblation = len_poblation
+        self.valor_min = valor_min
+        self.valor_max = valor_max
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.plan = OperatorPlan(crossover_method, mutation_method, selection_method,
+                                 crossover_param, mutation_param, selection_param,
+                                 valor_min, valor_max, rng=self.rng)
+        self.counts = None  # dict a rellenar por generación si hay profiler
+        self.objective = None  # fitness por lotes (p. ej. solar_geometry.ShadingObjective)
+        # PopulationStats de la última generación; si breed reemplaza in situ
+        # (estado estacionario) se actualiza con update() en lugar de recalcularse
+        self.tracked = None
+        self.tracked_valid = False
+
+    def create_poblation(self):
+        return create_poblation(self.len_poblation, self.valor_min, self.valor_max, self.rng)
+
+    def get_rng_state(self):
+        return self.rng.getstate()
+
+    def set_rng_state(self, state):
+        self.rng.setstate(state)
+
+    def get_stats_state(self):
+        """Sumas de PopulationStats que arrastra el reemplazo in situ (None si no hay)."""
+        return self.tracked.get_state() if self.tracked_valid else None
+
+    def set_stats_state(self, poblation, target_distance, state):
+        # las sumas actualizadas con update() no coinciden bit a bit con
+        # las recalculadas: se restauran para continuar de forma idéntica
+        if state is not None:
+            self.tracked = PopulationStats(poblation, target_distance)
+            self.tracked.set_state(state)
+            self.tracked_valid = True
+
+    def rank(self, poblation, target_distance):
+        if self.objective is None:
+            return RankedPopulation(poblation, target_distance)
+        return RankedPopulation(poblation, target_distance, self.objective(poblation).tolist())
+
+    def stats(self, poblation, ranked, target_distance):
+        tracked = self.tracked
+        if not (self.tracked_valid and tracked.poblation is poblation and tracked.target == target_distance):
+            tracked = self.tracked = PopulationStats(poblation, target_distance)
+        self.tracked_valid = False
+        stats = tracked.as_dict()
+        stats["best"] = ranked.best()
+        if self.objective is not None:
+            stats["mean_fitness"] = sum(ranked.fitnesses) / len(ranked.fitnesses)
+        return stats
+
+    def empty_poblation(self):
+        return [0.0] * self.len_poblation
+
+    def breed(self, ranked, pm, pc, out, positions):
+        """
+        Escribe un hijo en out[i] para cada i de positions. Los padres y los
+        sorteos de cruce y mutación se extraen por bloques antes del bucle.
+        Si out es la población de la última llamada a stats (reemplazo in
+        situ), las escrituras pasan por PopulationStats.update.
+        """
+        tracked = self.tracked
+        incremental = tracked is not None and tracked.poblation is out
+        write = tracked.update if incremental else out.__setitem__
+        crossover, mutation = self.plan.crossover, self.plan.mutation
+        n_cross = n_mut = 0
+        n = len(positions)
+        n_pairs = (n + 1)//2
+        padres = self.plan.select_many(ranked, 2*n_pairs)
+        rnd = self.rng.random
+        sorteos = [rnd() for _ in range(3*n_pairs)]
+        for k in range(n_pairs):
+            p1, p2 = padres[2*k], padres[2*k+1]
+            if sorteos[3*k] < pc:
+                h1,h2 = crossover(p1, p2)
+                n_cross += 1
+            else:
+                h1,h2 = p1,p2
+            if sorteos[3*k+1] < pm:
+                h1 = mutation(h1)
+                n_mut += 1
+            if sorteos[3*k+2] < pm:
+                h2 = mutation(h2)
+                n_mut += 1
+            write(positions[2*k], h1)
+            if 2*k + 1 < n:
+                write(positions[2*k+1], h2)
+        self.tracked_valid = incremental
+        if self.counts is not None:
+            self.counts.update(selections=2*n_pairs, crossovers=n_cross, mutations=n_mut)
+
+class Replacement:
+    """
+    Estrategia de reemplazo, común a ambos motores:
+      "generational": la nueva generación se escribe en un búfer preasignado
+          que se alterna con el actual; los 'elitism' mejores pasan intactos.
+      "steady_state": en cada generación se crean steady_state_size hijos
+          (por defecto 2) que sustituyen in situ a los peores individuos.
+
+    Ninguna de las dos opciones acelera la convergencia con los valores por
+    defecto (10 individuos, torneo de la mitad de la población): conservar a
+    los mejores añade presión selectiva, la población colapsa antes (pstdev
+    media de ~230 a ~180 con elitism=2 y ~120 con steady_state_size=4) y se
+    necesitan más generaciones para llegar a la tolerancia (ver
+    benchmarks/bench_early_stopping.py). No es efecto de la adaptación por
+    diversidad, que con pm fijo es aún peor. Con elitismo basta bajar la
+    presión del torneo (selection_param=0.2 lo deja por debajo del
+    generacional puro); el reemplazo estacionario sigue siendo más lento
+    aun así y en este problema no se recomienda.
+    """
+    def __init__(self, eng, replacement="generational", elitism=0, steady_state_size=None):
+        if replacement not in ("generational", "steady_state"):
+            raise ValueError(f"Estrategia de reemplazo desconocida: {replacement}")
+        self.eng = eng
+        self.steady_state = replacement == "steady_state"
+        self.elitism = elitism
+        self.steady_state_size = steady_state_size or 2
+        self.spare = None
+
+    def __call__(self, poblacion, ranked, pm, pc):
+        n = len(poblacion)
+        if self.steady_state:
+            worst = ranked.order[n - min(self.steady_state_size, n):]
+            self.eng.breed(ranked, pm, pc, poblacion, worst)
+            return poblacion
+        nueva = self.spare if self.spare is not None else self.eng.empty_poblation()
+        for i, idx in enumerate(ranked.order[:self.elitism]):
+            nueva[i] = poblacion[idx]
+        self.eng.breed(ranked, pm, pc, nueva, range(min(self.elitism, n), n))
+        self.spare = poblacion
+        return nueva
+
+def make_engine(engine, **kwargs):
+    if engine == "python":
+        return PythonEngine(**kwargs)
+    if engine == "numpy":
+        from ga_numpy import NumpyEngine
+        return NumpyEngine(**kwargs)
+    raise ValueError(f"Motor desconocido: {engine}")
+
 # --- Función principal GA ---
 
-def genetic_algorithm(
+def iter_generations(
     max_generations:int,
     latitude:float,
     season:str,
@@ -100,67 +618,337 @@ def genetic_algorithm(
     crossover_method:str="sbx",
     mutation_method:str="gaussian_mutation",
     crossover_param:float=None,
-    mutation_param:float=None
-    ) -> dict:
+    mutation_param:float=None,
+    # selección
+    selection_method:str="tournament",     # "tournament", "rank" o "truncation"
+    selection_param:float=None,
+    # motor de ejecución
+    engine:str="python",                    # "python" o "numpy"
+    seed:int=None,
+    rng=None,
+    include_population:bool=False,
+    # parada anticipada (ver StoppingCriteria)
+    tol_abs:float=None,
+    tol_rel:float=None,
+    patience:int=None,
+    min_diversity:float=None,
+    time_budget:float=None,
+    # instrumentación (ver ga_profiling.GAProfiler)
+    profiler=None,
+    # intercambio de individuos (ver ga_islands)
+    migration=None,
+    # búsqueda local memética (ver ga_memetic.MemeticSearch)
+    memetic_every:int=None,
+    memetic_top_k:int=1,
+    memetic_evals:int=20,
+    memetic_budget:int=None,
+    # reemplazo (ver Replacement)
+    replacement:str="generational",         # "generational" o "steady_state"
+    elitism:int=0,
+    steady_state_size:int=None,
+    # puntos de control (ver ga_checkpoint)
+    checkpoint=None,
+    resume:dict=None,
+    # función de fitness (ver solar_geometry.ShadingObjective)
+    fitness_mode:str="target",              # "target", "shaded_hours" o "lost_irradiance"
+    land_weight:float=None,
+    sun_step_minutes:int=60
+    ):
+    """
+    Generador que ejecuta el AG y produce un dict por generación:
+      'generation': índice de la generación (0..max_generations),
+      'target': distancia objetivo,
+      'pm', 'pc': probabilidades usadas para crear la siguiente generación
+                  (None en la última, que no se reproduce),
+      'stop_reason': None salvo en la última generación, donde vale
+                  "max_generations", "tolerance", "stagnation", "diversity"
+                  o "time_budget",
+      'best': mejor individuo, 'fitness': su fitness,
+      'mean', 'pstdev', 'min', 'max', 'mean_fitness': estadísticas de la
+                  población (ver PopulationStats),
+      'population': la población (solo con include_population=True; es el
+                    búfer del motor, que se reutiliza: copiarlo si se quiere
+                    conservar),
+      'memetic': resumen de la búsqueda local (solo en la última generación
+                 y si memetic_every está activo)
+      'seed': semilla de la corrida (solo en la última generación)
+
+    Todos los números aleatorios salen de rng: un random.Random con
+    engine="python" o un numpy.random.Generator con engine="numpy". Si no se
+    da, el motor crea el suyo con seed, y si seed es None se toma una nueva
+    de la entropía del sistema; la semilla usada se devuelve para poder
+    repetir la corrida (con rng explícito 'seed' es el seed recibido). Para
+    corridas en paralelo ga_sweep.spawn_seeds da semillas independientes.
+
+    Dejar de consumir el generador detiene el algoritmo. Con profiler se
+    miden las fases de cada generación y se disparan sus ganchos.
+    migration(gen, poblacion, target) se llama al inicio de cada generación,
+    antes de evaluarla, y devuelve la población (posiblemente con
+    inmigrantes) con la que se continúa. Con memetic_every=M, cada M
+    generaciones los memetic_top_k mejores se refinan con búsqueda de
+    sección dorada (memetic_evals evaluaciones por búsqueda, memetic_budget
+    en total).
+
+    checkpoint (ga_checkpoint.Checkpointer) guarda al inicio de las
+    generaciones que indique el estado completo de la corrida: población,
+    fit_prev, últimos pm/pc, estado del generador aleatorio, índice de la
+    generación y estado de los criterios de parada y de la búsqueda local.
+    Con resume=estado guardado la corrida continúa desde ese punto y produce
+    exactamente los mismos registros que sin interrupción.
+
+    Con fitness_mode="target" el fitness es |x - target|. Con
+    "shaded_hours" o "lost_irradiance" se evalúa el sombreado a lo largo de
+    todo el año sobre una tabla de posiciones solares cada sun_step_minutes
+    (ver solar_geometry.ShadingObjective), para toda la población de una
+    vez; 'target' sigue siendo la distancia del instante crítico, como
+    referencia, y 'fitness'/'mean_fitness' pasan a ser los del objetivo anual.
+    """
+    sd = summer_solar_decline if season.lower() in ["verano","summer"] else winter_solar_decline
+    target = min_distance(panel_dimensions, latitude, inclination_degree, sd)
+    if seed is None and rng is None:
+        seed = fresh_seed()
+
+    eng = make_engine(
+        engine, len_poblation=len_poblation, valor_min=valor_min, valor_max=valor_max,
+        crossover_method=crossover_method, mutation_method=mutation_method,
+        crossover_param=crossover_param, mutation_param=mutation_param,
+        selection_method=selection_method, selection_param=selection_param, seed=seed, rng=rng)
+
+    if fitness_mode != "target":
+        from solar_geometry import ShadingObjective
+        eng.objective = ShadingObjective(latitude, panel_dimensions[0], inclination_degree, fitness_mode,
+                                         land_weight, sun_step_minutes)
+        objective = lambda x: float(eng.objective(x))
+    else:
+        objective = partial(fitness, target_distance=target)
+
+    replace = Replacement(eng, replacement, elitism, steady_state_size)
+    prof = profiler
+    if prof is not None:
+        eng.counts = {}
+    criteria = StoppingCriteria(tol_abs, tol_rel, patience, min_diversity, time_budget)
+    memetic = None
+    if memetic_every:
+        from ga_memetic import MemeticSearch
+        memetic = MemeticSearch(objective, valor_min, valor_max,
+                                memetic_every, memetic_top_k, memetic_evals, memetic_budget)
+    poblacion = eng.create_poblation()
+    fit_prev = None
+    pm = pc = None
+    first_gen = 0
+    if resume is not None:
+        first_gen = resume["generation"]
+        poblacion = resume["poblacion"]
+        fit_prev, pm, pc = resume["fit_prev"], resume["pm"], resume["pc"]
+        eng.set_rng_state(resume["rng_state"])
+        eng.set_stats_state(poblacion, target, resume.get("stats_state"))
+        criteria.set_state(resume["criteria"])
+        if memetic is not None:
+            memetic.set_state(resume["memetic"])
+    for gen in range(first_gen, max_generations + 1):
+        if checkpoint is not None and gen > first_gen and checkpoint.due(gen):
+            checkpoint.save({
+                "generation": gen,
+                "poblacion": poblacion,
+                "fit_prev": fit_prev,
+                "pm": pm,
+                "pc": pc,
+                "rng_state": eng.get_rng_state(),
+                "stats_state": eng.get_stats_state(),
+                "criteria": criteria.get_state(),
+                "memetic": None if memetic is None else memetic.get_state()
+            })
+        if migration is not None:
+            poblacion = migration(gen, poblacion, target)
+        if prof is not None:
+            prof.generation_start(gen)
+            prof.start("rank")
+        ranked = eng.rank(poblacion, target)
+        if prof is not None:
+            prof.count("fitness_evaluations", len(poblacion))
+            prof.switch("stats")
+        stats = eng.stats(poblacion, ranked, target)
+        if memetic is not None and memetic.due(gen):
+            if prof is not None:
+                prof.switch("memetic")
+            if memetic.refine(poblacion, ranked, stats):
+                ranked = eng.rank(poblacion, target)
+                stats = eng.stats(poblacion, ranked, target)
+        best_fitness = ranked.best_fitness()
+        stop_reason = "max_generations" if gen == max_generations else criteria.check(stats, best_fitness, target)
+        if prof is not None:
+            prof.switch("adaptation")
+        pm = pc = None
+        if stop_reason is None:
+            if adaptation_method=="diversity":
+                pm, pc = diversity_probabilities(stats["pstdev"], pm_min, pm_max, pc_min, pc_max, k_m, k_c)
+            else:
+                pm, pc = fitness_probabilities(fit_prev, stats["mean_fitness"], pm_min, pm_max, pc_min, pc_max)
+                fit_prev = stats["mean_fitness"]
+        if prof is not None:
+            prof.stop()
+
+        record = {
+            "generation": gen,
+            "target": target,
+            "pm": pm,
+            "pc": pc,
+            "stop_reason": stop_reason,
+            "fitness": best_fitness,
+            **stats
+        }
+        if include_population:
+            record["population"] = poblacion
+        if memetic is not None and stop_reason is not None:
+            record["memetic"] = memetic.report()
+        if stop_reason is not None:
+            record["seed"] = seed
+        yield record
+
+        if stop_reason is not None:
+            if prof is not None:
+                prof.generation_end(record)
+            return
+        if prof is not None:
+            prof.start("reproduction")
+        poblacion = replace(poblacion, ranked, pm, pc)
+        if prof is not None:
+            prof.stop()
+            for name, n in eng.counts.items():
+                prof.count(name, n)
+            prof.generation_end(record)
+
+# --- Historial ---
+
+class ListHistory:
+    """Historial original: listas de Python con una copia de cada población."""
+    def start(self, max_generations, len_poblation):
+        self.history = []
+        self.populations = []
+        self.bests = []
+        self.stats = {key: [] for key in STATS_KEYS}
+
+    def record(self, record):
+        self.populations.append(list(record["population"]))
+        self.bests.append(record["best"])
+        for key, values in self.stats.items():
+            values.append(record[key])
+        if record["pm"] is not None:
+            self.history.append((record["pm"], record["pc"]))
+
+    def result(self):
+        return {
+            "history": self.history,
+            "populations": self.populations,
+            "bests": self.bests,
+            "stats": self.stats
+        }
+
+    def nbytes(self):
+        """Memoria aproximada: listas de punteros más un float por valor."""
+        floats = sum(len(p) for p in self.populations) + len(self.bests) + 2*len(self.history)
+        floats += sum(len(v) for v in self.stats.values())
+        return floats * (8 + sys.getsizeof(0.0))
+
+def make_recorder(recorder):
+    """
+    recorder puede ser "list", "summary", "array", "downsample", "memmap"
+    (ver ga_history) o un objeto con la misma interfaz que ListHistory.
+    """
+    if not isinstance(recorder, str):
+        return recorder
+    if recorder == "list":
+        return ListHistory()
+    from ga_history import RECORDERS
+    return RECORDERS[recorder]()
+
+def run_params(*args, **kwargs):
+    """Argumentos de iter_generations con los valores por defecto aplicados, como dict."""
+    import inspect
+    bound = inspect.signature(iter_generations).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+def genetic_algorithm(*args, recorder="list", **kwargs) -> dict:
     """
     Devuelve un dict con:
       'best': mejor individuo,
-      'fitness': fitness(mejor, target_distance),
+      'fitness': fitness del mejor (|mejor - target| o el objetivo anual,
+                 ver fitness_mode),
       'history': lista de tuplas (pm, pc) por generación,
       'populations': lista de poblaciones por generación,
-      'bests': lista de mejores por generación
-    """
-    sd = summer_solar_decline if season.lower() in ["verano","summer"] else winter_solar_decline
-    target = min_distance(panel_dimensions, latitude, inclination_degree, sd)
+      'bests': lista de mejores por generación,
+      'stats': dict con listas por generación de 'mean', 'pstdev', 'min',
+               'max', 'mean_fitness' y 'best',
+      'generations': generaciones evolucionadas,
+      'stop_reason': motivo de parada (ver iter_generations),
+      'seed': semilla con la que repetir la corrida (ver iter_generations),
+      'profile': informe de tiempos y contadores (solo si se pasa profiler),
+      'memetic': aplicaciones, evaluaciones extra, mejoras y ganancia de la
+                 búsqueda local (solo con memetic_every)
+
+    Acepta los mismos argumentos que iter_generations (salvo
+    include_population) más recorder.
+
+    Con engine="numpy" la generación completa se calcula con operaciones
+    vectorizadas (ver ga_numpy.NumpyEngine). Para consumir los resultados
+    a medida que se producen usar iter_generations.
 
-    poblacion = create_poblation(len_poblation, valor_min, valor_max)
-    fit_prev = avg_fitness(poblacion, target) if adaptation_method=="fitness" else None
-
-    history = []
-    pop_history = []
-    best_history = []
-    for gen in range(max_generations):
-        pop_history.append(poblacion.copy())
-        best_curr = ranking_selection(poblacion, target, 1.0)
-        best_history.append(best_curr)
-        if adaptation_method=="diversity":
-            pm, pc = diversity_adaptation(poblacion, pm_min, pm_max, pc_min, pc_max, k_m, k_c)
+    recorder elige cómo se guarda el historial (ver make_recorder); con los
+    registradores de ga_history 'history', 'populations' y 'bests' son
+    vistas de arrays y ga_history.history_as_lists recupera las listas.
+
+    Con checkpoint cada punto de control incluye además los parámetros de la
+    corrida y el historial registrado; ga_checkpoint.resume continúa desde
+    el archivo guardado.
+    """
+    if kwargs.get("seed") is None and kwargs.get("rng") is None:
+        kwargs["seed"] = fresh_seed()
+    params = run_params(*args, **kwargs)
+    profiler, checkpoint, resume = params["profiler"], params["checkpoint"], params["resume"]
+    if resume is not None:
+        rec = resume["recorder"]
+    else:
+        rec = make_recorder(recorder)
+        rec.start(params["max_generations"], params["len_poblation"])
+    if checkpoint is not None:
+        saved = {key: value for key, value in params.items()
+                 if key not in ("profiler", "migration", "checkpoint", "resume", "rng", "include_population")}
+        checkpoint.attach(params={**saved, "recorder": recorder}, recorder=rec)
+    for record in iter_generations(**{**params, "include_population": True}):
+        if profiler is None:
+            rec.record(record)
         else:
-            fit_curr = avg_fitness(poblacion, target)
-            deltaF = (fit_prev - fit_curr)/fit_prev if fit_prev else 0
-            fit_prev = fit_curr
-            pm = pm_min + (pm_max - pm_min)*(1 - deltaF)
-            pc = pc_min + (pc_max - pc_min)*deltaF
-        history.append((pm, pc))
-
-        nueva = []
-        while len(nueva) < len_poblation:
-            p1 = ranking_selection(poblacion, target, 0.5)
-            p2 = ranking_selection(poblacion, target, 0.5)
-            if random.random() < pc:
-                fn = globals()[crossover_method]
-                h1,h2 = fn(p1, p2) if crossover_param is None else fn(p1, p2, crossover_param)
-            else:
-                h1,h2 = p1,p2
-            fnm = globals()[mutation_method]
-            if random.random() < pm:
-                args = (h1, valor_min, valor_max) if mutation_method=="gaussian_mutation" else (h1, valor_min, valor_max, mutation_param or 20)
-                h1 = fnm(*args)
-            if random.random() < pm:
-                args = (h2, valor_min, valor_max) if mutation_method=="gaussian_mutation" else (h2, valor_min, valor_max, mutation_param or 20)
-                h2 = fnm(*args)
-            nueva.extend([h1,h2])
-        poblacion = nueva[:len_poblation]
-
-    pop_history.append(poblacion.copy())
-    best_history.append(ranking_selection(poblacion, target, 1.0))
-
-    best = best_history[-1]
-    return {
+            profiler.start("history")
+            rec.record(record)
+            profiler.stop()
+            profiler.count("history_records")
+
+    target = record["target"]
+    best = record["best"]
+    result = {
         "target": target,
         "best": best,
-        "fitness": fitness(best, target),
-        "history": history,
-        "populations": pop_history,
-        "bests": best_history
+        "fitness": record["fitness"],
+        "generations": record["generation"],
+        "stop_reason": record["stop_reason"],
+        "seed": record["seed"],
+        **rec.result()
     }
+    if "memetic" in record:
+        result["memetic"] = record["memetic"]
+    if profiler is not None:
+        profiler.count("history_bytes", rec.nbytes())
+        result["profile"] = profiler.report()
+    return result
+
+if __name__ == "__main__":
+    # python -m taller2ag: la interfaz de línea de comandos vive en ga_cli.
+    # Este archivo ya se está ejecutando como __main__; se registra también
+    # como taller2ag para que ga_cli (y ga_numpy, ga_vector...) lo reutilicen
+    # en lugar de ejecutarlo otra vez con un segundo registro OPERATORS.
+    main_module = sys.modules.get(__name__)
+    if main_module is not None and vars(main_module) is globals():
+        sys.modules.setdefault("taller2ag", main_module)
+    from ga_cli import main
+    sys.exit(main())
@@ -1,13 +1,39 @@
 # test_AG.py
 
 import streamlit as st
-from taller2ag import genetic_algorithm
+from taller2ag import OPERATORS, ADAPTATION_METHODS
+from ga_jobs import GAJob, ResultCache, params_key
+from ga_history import envelope, population_histograms
+from ga_tuner import load_preset
+import altair as alt
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 st.title("📐 Optimización GA: Distancia entre Paneles Solares")
 
+# Caché de resultados compartida por todas las sesiones (LRU acotada)
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(max_entries=16)
+
+cache = get_result_cache()
+
+MAX_POINTS = 400  # puntos por serie en las gráficas; las series largas se agrupan en cubetas
+
+def envelope_chart(series, y_title):
+    """Media por cubeta de cada serie con una banda entre el mínimo y el máximo."""
+    frames = []
+    for name, values in series.items():
+        env = envelope(values, MAX_POINTS)
+        frames.append(pd.DataFrame({"generación": env["x"] + 1, "serie": name,
+                                    "media": env["mean"], "mín": env["min"], "máx": env["max"]}))
+    df = pd.concat(frames)
+    base = alt.Chart(df).encode(x="generación:Q", color="serie:N")
+    band = base.mark_area(opacity=0.25).encode(y=alt.Y("mín:Q", title=y_title), y2="máx:Q")
+    line = base.mark_line().encode(y="media:Q", tooltip=["generación", "serie", "media", "mín", "máx"])
+    return band + line
+
 # --- Entradas obligatorias ---
 max_gens = st.number_input("Número de generaciones", min_value=1, value=50, step=1, help="El numero de generaciónes que el algoritmo genético realizará.")
 latitude = st.number_input("Latitud (°)", min_value=-90.0, max_value=90.0, value=41.0, step=0.1, help="Latitud de la ubicación donde se instalarán los paneles solares.")
@@ -15,22 +41,45 @@ season = st.selectbox("Temporada", ["Invierno", "Verano"], help="Selecciona la t
 
 # --- Parámetros avanzados en expander ---
 with st.expander("⚙️ Parámetros avanzados"):
+    preset_file   = st.file_uploader("Preset de parámetros (JSON)", type="json", help="Preset generado con `python -m taller2ag tune` (ga_tuner). Sus valores pasan a ser los valores iniciales de los campos de abajo.")
+    preset = {}
+    if preset_file is not None:
+        try:
+            preset = load_preset(preset_file)
+        except (ValueError, KeyError) as e:
+            st.error(f"❌ Preset no válido: {e}")
+    def option_index(names, key):
+        # un valor desconocido en el preset no debe romper la página
+        names = list(names)
+        return names.index(preset[key]) if preset.get(key) in names else 0
+    def param_value(kind, method, key, fallback):
+        if key not in preset:
+            return fallback
+        if preset[key] is not None:
+            return float(preset[key])
+        # None es el valor por defecto del operador; si ese valor es None
+        # (cruce aritmético: α aleatorio) se muestra 0.0, que la validación
+        # vuelve a convertir en None
+        default = OPERATORS[kind][method].default
+        return 0.0 if default is None else float(default)
     len_pop       = st.number_input("Tamaño población", min_value=2, value=10, step=1, help="Número de individuos en la población.")
     val_min       = st.number_input("Valor mínimo individuo (mm)", value=0.0, step=1.0, help="Valor mínimo que puede tomar un individuo, debe ser menor que el valor máximo.")
     val_max       = st.number_input("Valor máximo individuo (mm)", value=10000.0, step=1.0, help="Valor máximo que puede tomar un individuo, debe ser mayor que el valor mínimo.")
     dims          = st.text_input("Dimensiones panel B,L,H (mm)", "1476,659,35", help="Dimensiones del panel solar en mm. Separar por comas. Ejemplo: 1476,659,35 para un panel de 1476 mm de ancho, 659 mm de largo y 35 mm de alto.")
     incl_deg      = st.number_input("Inclinación β (°)", min_value=0.0, max_value=90.0, value=45.0, step=0.1, help="Inclinación del panel solar en grados. Debe ser entre 0 y 90 grados.")
-    pm_min        = st.number_input("pm_min", min_value=0.0, max_value=1.0, value=0.1, step=0.01, help="Probabilidad mínima de mutación en el algoritmo genético.")
-    pm_max        = st.number_input("pm_max", min_value=0.0, max_value=1.0, value=0.4, step=0.01, help="Probabilidad máxima de mutación en el algoritmo genético.")
-    pc_min        = st.number_input("pc_min", min_value=0.0, max_value=1.0, value=0.3, step=0.01, help="Probabilidad mínima de cruce en el algoritmo genético.")
-    pc_max        = st.number_input("pc_max", min_value=0.0, max_value=1.0, value=0.7, step=0.01, help="Probabilidad máxima de cruce en el algoritmo genético.")
-    k_m           = st.number_input("k_m", min_value=0.0, value=0.035, step=0.005, help="Parámetro de mutación (k_m) para el algoritmo genético, controla la velocidad de cambio en el valor de la probabilidad de mutación cuando se usa el método de adaptación por diversidad.")
-    k_c           = st.number_input("k_c", min_value=0.0, value=0.08, step=0.005, help="Parámetro de cruce (k_c) para el algoritmo genético, controla la velocidad de cambio en el valor de la probabilidad de cruce cuando se usa el método de adaptación por diversidad.")
-    cross_method  = st.selectbox("Método de cruce", ["Cruce aritmetico","blx_alpha","sbx"], help="Selecciona el método de cruce que deseas utilizar en el algoritmo genético.")
-    mut_method    = st.selectbox("Método de mutación", ["Mutación Gaussiana","Mutación Polinómica"], help="Selecciona el método de mutación que deseas utilizar en el algoritmo genético.")
-    adaptation_method    = st.selectbox("Método de adaptación", ["Por Diversidad","Por Fitness"], help="Selecciona el método de adaptación que deseas utilizar en el algoritmo genético.")
-    cross_param   = st.number_input("Parámetro cruce (α o η)", value=0.3, step=0.1, help="Parámetro de cruce (α o η) para el método de cruce seleccionado. Para el método aritmetico, este parámetro no es necesario y se puede dejar en 0, pero se recomienda usar un valor entre 0 y 1. Para el método BLX, este parámetro debe estar entre 0 y 1. Para el método SBX, este parámetro debe estar entre 2 y 5.")
-    mut_param     = st.number_input("Parámetro mutación (σ o ηₘ)", value=500.0, step=10.0, help="Parámetro de mutación (σ o ηₘ) para el método de mutación seleccionado. Para el método de mutación polinómica, este parámetro debe estar entre 0 y 1. Para el método de mutación gaussiana, este parámetro debe estar entre 0 y 1000.")
+    pm_min        = st.number_input("pm_min", min_value=0.0, max_value=1.0, value=preset.get("pm_min", 0.1), step=0.01, help="Probabilidad mínima de mutación en el algoritmo genético.")
+    pm_max        = st.number_input("pm_max", min_value=0.0, max_value=1.0, value=preset.get("pm_max", 0.4), step=0.01, help="Probabilidad máxima de mutación en el algoritmo genético.")
+    pc_min        = st.number_input("pc_min", min_value=0.0, max_value=1.0, value=preset.get("pc_min", 0.3), step=0.01, help="Probabilidad mínima de cruce en el algoritmo genético.")
+    pc_max        = st.number_input("pc_max", min_value=0.0, max_value=1.0, value=preset.get("pc_max", 0.7), step=0.01, help="Probabilidad máxima de cruce en el algoritmo genético.")
+    k_m           = st.number_input("k_m", min_value=0.0, value=preset.get("k_m", 0.035), step=0.005, help="Parámetro de mutación (k_m) para el algoritmo genético, controla la velocidad de cambio en el valor de la probabilidad de mutación cuando se usa el método de adaptación por diversidad.")
+    k_c           = st.number_input("k_c", min_value=0.0, value=preset.get("k_c", 0.08), step=0.005, help="Parámetro de cruce (k_c) para el algoritmo genético, controla la velocidad de cambio en el valor de la probabilidad de cruce cuando se usa el método de adaptación por diversidad.")
+    cross_method  = st.selectbox("Método de cruce", list(OPERATORS["crossover"]), index=option_index(OPERATORS["crossover"], "crossover_method"), format_func=lambda name: OPERATORS["crossover"][name].label, help="Selecciona el método de cruce que deseas utilizar en el algoritmo genético.")
+    mut_method    = st.selectbox("Método de mutación", list(OPERATORS["mutation"]), index=option_index(OPERATORS["mutation"], "mutation_method"), format_func=lambda name: OPERATORS["mutation"][name].label, help="Selecciona el método de mutación que deseas utilizar en el algoritmo genético.")
+    sel_method    = st.selectbox("Método de selección", list(OPERATORS["selection"]), index=option_index(OPERATORS["selection"], "selection_method"), format_func=lambda name: OPERATORS["selection"][name].label, help="Selecciona el método de selección de padres.")
+    adaptation_method    = st.selectbox("Método de adaptación", list(ADAPTATION_METHODS), index=option_index(ADAPTATION_METHODS, "adaptation_method"), format_func=ADAPTATION_METHODS.get, help="Selecciona el método de adaptación que deseas utilizar en el algoritmo genético.")
+    cross_param   = st.number_input("Parámetro cruce (α o η)", value=param_value("crossover", cross_method, "crossover_param", 0.3), step=0.1, help="Parámetro de cruce (α o η) para el método de cruce seleccionado. Para el método aritmetico, este parámetro no es necesario y se puede dejar en 0, pero se recomienda usar un valor entre 0 y 1. Para el método BLX, este parámetro debe estar entre 0 y 1. Para el método SBX, este parámetro debe estar entre 2 y 5.")
+    mut_param     = st.number_input("Parámetro mutación (σ o ηₘ)", value=param_value("mutation", mut_method, "mutation_param", 500.0), step=10.0, help="Parámetro de mutación (σ o ηₘ) para el método de mutación seleccionado. Para el método de mutación polinómica, este parámetro debe estar entre 0 y 100. Para el método de mutación gaussiana, este parámetro debe estar entre 0 y 1000.")
+    seed          = st.number_input("Semilla", min_value=0, value=0, step=1, help="Semilla del generador aleatorio. Con los mismos parámetros y la misma semilla el resultado es idéntico y se recupera de la caché.")
 
 # --- Botón de ejecución ---
 if st.button("▶️ Ejecutar GA"):
@@ -38,49 +87,31 @@ if st.button("▶️ Ejecutar GA"):
     panel_dims = [B,L,H]
     
     
-    # Cambiar nombres de métodos de cruce, mutación y adaptación a los nombres usados en el código
-    if adaptation_method == "Por Diversidad":
-        adaptation_method = "diversity"
-    elif adaptation_method == "Por Fitness":   
-        adaptation_method = "fitness"
-        
-    if cross_method == "Cruce aritmetico":
-        cross_method = "arithmetic_crossover"
-    elif cross_method == "blx_alpha":
-        cross_method = "blx_alpha"
-    elif cross_method == "sbx":
-        cross_method = "sbx"
-        
-    if mut_method == "Mutación Gaussiana":
-        mut_method = "gaussian_mutation"
-    elif mut_method == "Mutación Polinómica":
-        mut_method = "polynomial_mutation"
-    
-    # Volver none cross_param = 0 si el método es arithmetic_crossover
-    if cross_method == "arithmetic_crossover" and cross_param <= 0.0:
-        cross_param = None
-    # verificar que cross_param no sea mayor a 5 ni menor a 2 si el método es sbx
-    if cross_method == "sbx" and (cross_param < 2.0 or cross_param > 5.0):
-        st.error("❌ Parámetro de cruce (α) debe ser entre 2 y 5 para el método SBX")
-        st.stop()
-    # verificar que cross_param no sea menor a 0.0 ni mayor a 1 si el método es blx_alpha o arithmetic_crossover
-    if cross_method == "blx_alpha" and (cross_param < 0.0 or cross_param > 1.0):
-        st.error("❌ Parámetro de cruce (α) debe ser entre 0 y 1 para el método BLX o arithmetic_crossover")
-        st.stop()
-    # verificar que mut_param no sea menor a 20 ni mayor a 100 si el método es polynomial_mutation
-    if mut_method == "polynomial_mutation" and (mut_param < 0.0 or mut_param > 1.0):
-        st.error("❌ Parámetro de mutación (ηₘ) debe ser entre 0 y 1 para el método polynomial_mutation")
-        st.stop()
-    if mut_method == "gaussian_mutation" and (mut_param < 0.0 or mut_param > 1000.0):
-        st.error("❌ Parámetro de mutación (σ) debe ser entre 0 y 1000 para el método gaussian_mutation")
-        st.stop()
-    
+    # Validar los parámetros con el esquema registrado de cada operador
+    op_params = {"crossover": cross_param, "mutation": mut_param}
+    for kind, name in [("crossover", cross_method), ("mutation", mut_method)]:
+        op = OPERATORS[kind][name]
+        if not op.params:
+            continue
+        schema = op.params[op.param_name]
+        # Con valor por defecto None (p. ej. cruce aritmético) un valor <= 0 significa "aleatorio"
+        if schema.get("default") is None and op_params[kind] <= 0.0:
+            op_params[kind] = None
+            continue
+        # sin límites registrados no hay nada que validar
+        if "min" not in schema or "max" not in schema:
+            continue
+        if not schema["min"] <= op_params[kind] <= schema["max"]:
+            st.error(f"❌ Parámetro ({schema.get('label', op.param_name)}) debe ser entre {schema['min']:g} y {schema['max']:g} para el método {op.label}")
+            st.stop()
+    cross_param, mut_param = op_params["crossover"], op_params["mutation"]
+
     # verificar que las dimensiones no sean ninguna menor o igual a 0.0
     if any(d <= 0.0 for d in panel_dims):
         st.error("❌ Dimensiones del panel deben ser mayores a 0.0 mm")
         st.stop()
 
-    result = genetic_algorithm(
+    params = dict(
         max_generations   = max_gens,
         latitude          = latitude,
         season            = season.lower(),
@@ -97,9 +128,57 @@ if st.button("▶️ Ejecutar GA"):
         k_c               = k_c,
         crossover_method  = cross_method,
         mutation_method   = mut_method,
+        selection_method  = sel_method,
+        adaptation_method = adaptation_method,
         crossover_param   = cross_param,
-        mutation_param    = mut_param
+        mutation_param    = mut_param,
+        seed              = seed,
+        recorder          = "array"
     )
+    previous = st.session_state.get("ga_job")
+    if previous is not None:
+        previous.cancel()
+    cached = cache.get(params_key(params))
+    if cached is not None:
+        st.session_state["ga_job"] = None
+        st.session_state["ga_run"] = (params, cached)
+    else:
+        job = GAJob(params, cache)
+        job.start()
+        st.session_state["ga_job"] = job
+        st.session_state["ga_run"] = None
+
+# --- Progreso de la corrida en segundo plano ---
+job = st.session_state.get("ga_job")
+if job is not None:
+    @st.fragment(run_every=0.5)
+    def show_progress():
+        max_generations = job.params["max_generations"]
+        if job.is_alive():
+            best = "-" if job.best is None else f"{job.best:.2f} mm"
+            st.progress(min(job.generation / max_generations, 1.0),
+                        text=f"Generación {job.generation} de {max_generations} · mejor individuo: {best}")
+            if st.button("⏹️ Cancelar"):
+                job.cancel()
+            return
+        st.session_state["ga_job"] = None
+        if job.result is not None:
+            st.session_state["ga_run"] = (job.params, job.result)
+        elif job.error is not None:
+            st.session_state["ga_error"] = str(job.error)
+        elif job.cancelled:
+            st.session_state["ga_error"] = "Ejecución cancelada"
+        st.rerun()
+    show_progress()
+
+if "ga_error" in st.session_state:
+    st.error(f"❌ {st.session_state.pop('ga_error')}")
+
+run = st.session_state.get("ga_run")
+if run is not None:
+    params, result = run
+    panel_dims = params["panel_dimensions"]
+    incl_deg = params["inclination_degree"]
 
     st.success("✅ Ejecución completada")
     st.write("**Distancia Ideal (mm):**", round(result["target"],2))
@@ -113,8 +192,8 @@ if st.button("▶️ Ejecutar GA"):
                 "La línea azul claro representa la probabilidad de cruce $(p_c)$ y la línea azul oscuro representa la probabilidad de mutación $(p_m)$. "
                 "Ambas probabilidades se adaptan dinámicamente en función del método de adaptación seleccionado para permitir equilibrio entre la exploración y explotación según sea necesario.")
 
-    df = pd.DataFrame(result["history"], columns=["pm","pc"])
-    st.line_chart(df)
+    history = np.asarray(result["history"], dtype=float).reshape(-1, 2)
+    st.altair_chart(envelope_chart({"pm": history[:, 0], "pc": history[:, 1]}, "probabilidad"), use_container_width=True)
 
     # 2) Gráfica de evolución de los mejores
     # Explicación de la grafica
@@ -123,9 +202,7 @@ if st.button("▶️ Ejecutar GA"):
                 "La línea azul claro representa el mejor individuo en cada generación, que corresponde a la distancia entre paneles solares. "
                 "A medida que avanza el algoritmo genético, se espera que la distancia entre paneles solares converja hacia un valor óptimo. ")
 
-    df_bests = pd.DataFrame({"generación": range(1, len(result["bests"])+1),
-                             "mejor": result["bests"]})
-    st.line_chart(df_bests.set_index("generación"))
+    st.altair_chart(envelope_chart({"mejor": result["bests"]}, "distancia (mm)"), use_container_width=True)
 
     # 3) Gráfica de paneles solares
     # Explicación de la gráfica
@@ -190,10 +267,49 @@ if st.button("▶️ Ejecutar GA"):
 
     st.pyplot(fig)
 
-    # Mostrar población y mejor por generación
-    for i, (pop, best, history) in enumerate(zip(result["populations"], result["bests"], result["history"])):
-        st.markdown(f"#### Generación {i+1} ")
-        st.markdown(f"$p_c =$ {round(history[1],4)}")
-        st.markdown(f"$p_m =$ {round(history[0],4)}")
-        st.write("Población:", [round(d,2) for d in pop])
-        st.markdown(f"##### Mejor individuo: `{round(best,2)}`")
+    # 4) Distribución de la población por generación
+    st.markdown("### Distribución de la población")
+    st.markdown("Cada columna del mapa de calor es el histograma de la población en una generación; "
+                "la línea blanca es el mejor individuo y la discontinua la distancia ideal.")
+
+    populations = np.asarray(result["populations"], dtype=float)
+    pop_gens = np.asarray(result.get("population_generations", np.arange(len(populations))))
+    step = max(1, -(-len(populations) // MAX_POINTS))
+    counts, edges = population_histograms(populations[::step], bins=40)
+    fig_hist, ax_hist = plt.subplots()
+    shown = pop_gens[::step] + 1
+    ax_hist.imshow(counts.T, aspect="auto", origin="lower", cmap="viridis",
+                   extent=[shown[0] - 0.5, shown[-1] + 0.5, edges[0], edges[-1]])
+    ax_hist.plot(np.arange(1, len(result["bests"]) + 1), result["bests"], color="white", linewidth=1)
+    ax_hist.axhline(ideal, color="white", linestyle="dashed", linewidth=0.8)
+    ax_hist.set_xlabel("Generación")
+    ax_hist.set_ylabel("Distancia (mm)")
+    st.pyplot(fig_hist)
+
+    # 5) Detalle por generación: una sola tabla y un selector de generación
+    st.markdown("### Detalle por generación")
+    stats = result["stats"]
+    n_gens = len(result["bests"])
+    pm_pc = np.full((n_gens, 2), np.nan)
+    pm_pc[:len(history)] = history
+    df_gens = pd.DataFrame({
+        "generación": np.arange(1, n_gens + 1),
+        "p_m": pm_pc[:, 0],
+        "p_c": pm_pc[:, 1],
+        "mejor": np.asarray(result["bests"], dtype=float),
+        "media": stats["mean"],
+        "desv. estándar": stats["pstdev"],
+        "mín": stats["min"],
+        "máx": stats["max"],
+    })
+    st.dataframe(df_gens, hide_index=True, use_container_width=True)
+
+    if len(pop_gens) > 1:
+        gen = st.select_slider("Generación", options=list(pop_gens + 1), value=int(pop_gens[-1] + 1))
+    else:
+        gen = int(pop_gens[0] + 1)
+    row = int(np.searchsorted(pop_gens, gen - 1))
+    st.markdown(f"#### Generación {gen}")
+    st.markdown(f"$p_c =$ {df_gens['p_c'].iloc[gen-1]:.4f} · $p_m =$ {df_gens['p_m'].iloc[gen-1]:.4f} · "
+                f"Mejor individuo: `{df_gens['mejor'].iloc[gen-1]:.2f}`")
+    st.dataframe(pd.DataFrame({"individuo (mm)": np.sort(populations[row])}).round(2), height=250)
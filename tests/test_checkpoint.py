@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ga_checkpoint import Checkpointer, resume
+from ga_profiling import GAProfiler
+from taller2ag import genetic_algorithm
+
+# Una corrida interrumpida y reanudada desde su último punto de control debe
+# ser idéntica, bit a bit, a la misma corrida sin interrumpir.
+
+class Crash(Exception):
+    pass
+
+def crash_at(generation):
+    profiler = GAProfiler()
+    def crash(gen):
+        if gen == generation:
+            raise Crash
+    profiler.on("generation_start", crash)
+    return profiler
+
+def assert_same_run(resumed, full):
+    assert resumed["generations"] == full["generations"]
+    assert resumed["fitness"] == full["fitness"]
+    np.testing.assert_array_equal(resumed["bests"], full["bests"])
+    np.testing.assert_array_equal(resumed["history"], full["history"])
+    for key in full["stats"]:
+        np.testing.assert_array_equal(resumed["stats"][key], full["stats"][key])
+
+@pytest.mark.parametrize("kwargs", [{"engine": "python"}, {"engine": "numpy", "recorder": "array"},
+                                    {"engine": "python", "replacement": "steady_state"},
+                                    {"engine": "python", "replacement": "steady_state", "memetic_every": 3}])
+def test_resume_equals_uninterrupted_run(tmp_path, kwargs):
+    full = genetic_algorithm(60, 41, "invierno", len_poblation=15, seed=7, **kwargs)
+    path = tmp_path / "run.pkl"
+    with pytest.raises(Crash):
+        genetic_algorithm(60, 41, "invierno", len_poblation=15, seed=7, profiler=crash_at(45),
+                          checkpoint=Checkpointer(path, every=10), **kwargs)
+    assert_same_run(resume(path), full)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_steady_state_resume_keeps_incremental_stats(tmp_path, seed):
+    # las sumas que PopulationStats.update() arrastra entre generaciones no
+    # coinciden bit a bit con las recalculadas: el punto de control las guarda
+    full = genetic_algorithm(200, 41, "invierno", len_poblation=30, seed=seed, replacement="steady_state")
+    path = tmp_path / "run.pkl"
+    with pytest.raises(Crash):
+        genetic_algorithm(200, 41, "invierno", len_poblation=30, seed=seed, replacement="steady_state",
+                          profiler=crash_at(137), checkpoint=Checkpointer(path, every=7))
+    assert_same_run(resume(path), full)
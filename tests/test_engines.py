@@ -0,0 +1,88 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import ga_numpy
+from taller2ag import OPERATORS, RankedPopulation, genetic_algorithm, ranking_selection, tournament_cdf
+
+# Equivalencia estadística entre el motor Python y el NumPy: ambos usan los
+# mismos operadores pero consumen los números aleatorios en otro orden, así
+# que se comparan distribuciones y no corridas concretas.
+
+N_DRAWS = 20000
+N_SEEDS = 300
+
+def rank_sum_z(a, b):
+    """Estadístico z de Mann-Whitney (aproximación normal con corrección por empates)."""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    n1, n2 = len(a), len(b)
+    values = np.concatenate([a, b])
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    # rango medio para los empates
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.bincount(inverse, ranks) / counts)[inverse]
+    u = ranks[:n1].sum() - n1*(n1 + 1)/2
+    n = n1 + n2
+    var = n1*n2/12 * ((n + 1) - (counts**3 - counts).sum() / (n*(n - 1)))
+    return (u - n1*n2/2) / np.sqrt(var)
+
+# --- Selección ---
+
+def test_tournament_rank_frequencies_agree():
+    n = 10
+    poblation = [float(x) for x in random.Random(1).sample(range(1000), n)]
+    target = 0.0  # fitness = valor, así el rango es la posición en sorted(poblation)
+    rank_of = {x: r for r, x in enumerate(sorted(poblation))}
+    expected = np.diff(np.concatenate([[0.0], tournament_cdf(n, n // 2)]))
+
+    rng = random.Random(2)
+    scalar = [rank_of[ranking_selection(poblation, target, 0.5, rng)] for _ in range(N_DRAWS)]
+    ranked = RankedPopulation(poblation, target)
+    bulk = [rank_of[x] for x in ranked.tournament(0.5, random.Random(3), k=N_DRAWS)]
+    order = np.argsort(np.abs(np.asarray(poblation) - target), kind="stable")
+    idx = ga_numpy.rank_selection(order, ga_numpy.tournament_cdf(n, 0.5), N_DRAWS, np.random.default_rng(4))
+    vector = [rank_of[poblation[i]] for i in idx]
+
+    for ranks in (scalar, bulk, vector):
+        freq = np.bincount(ranks, minlength=n) / N_DRAWS
+        np.testing.assert_allclose(freq, expected, atol=0.015)
+
+def test_tiny_tournament_still_selects():
+    # int(10 * 0.05) == 0: el torneo se amplía a un participante (selección
+    # uniforme) en lugar de quedarse siempre con el peor individuo
+    poblation = [float(x) for x in range(10)]
+    uniform = np.full(10, 0.1)
+    winners = RankedPopulation(poblation, 0.0).tournament(0.05, random.Random(0), k=N_DRAWS)
+    np.testing.assert_allclose(np.bincount(np.asarray(winners, dtype=int), minlength=10) / N_DRAWS, uniform, atol=0.015)
+    winners = [ranking_selection(poblation, 0.0, 0.05, random.Random(seed)) for seed in range(N_DRAWS // 10)]
+    np.testing.assert_allclose(np.bincount(np.asarray(winners, dtype=int), minlength=10) / (N_DRAWS // 10), uniform, atol=0.04)
+    np.testing.assert_allclose(np.diff(ga_numpy.tournament_cdf(10, 0.05), prepend=0.0), uniform)
+
+# --- Motores ---
+
+@pytest.mark.parametrize("mutation_method", sorted(OPERATORS["mutation"]))
+@pytest.mark.parametrize("crossover_method", sorted(OPERATORS["crossover"]))
+def test_engines_same_fitness_distribution(crossover_method, mutation_method):
+    final = {}
+    for engine in ("python", "numpy"):
+        final[engine] = [genetic_algorithm(20, 41, "invierno", engine=engine, seed=seed, recorder="summary",
+                                           crossover_method=crossover_method,
+                                           mutation_method=mutation_method)["fitness"]
+                         for seed in range(N_SEEDS)]
+    # |z| > 3.3 equivale a p < 0.001 (dos colas)
+    assert abs(rank_sum_z(final["python"], final["numpy"])) < 3.3
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_same_seed_is_deterministic(engine):
+    runs = [genetic_algorithm(30, 41, "verano", engine=engine, seed=123, recorder="list") for _ in range(2)]
+    assert runs[0]["seed"] == runs[1]["seed"] == 123
+    assert runs[0]["bests"] == runs[1]["bests"]
+    assert runs[0]["history"] == runs[1]["history"]
+    assert runs[0]["fitness"] == runs[1]["fitness"]
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from solar_geometry import LayoutObjective, shaded_fraction
+
+# LayoutObjective.shading recorre las filas con un máximo acumulado por
+# bloques; se compara con el bucle explícito por pares de filas.
+
+def test_layout_shading_equals_pairwise_loop():
+    # chunk pequeño para recorrer también varios bloques de individuos
+    objective = LayoutObjective(41, 8, 30000, terrain_slope=np.linspace(-5, 8, 7), chunk=2**12)
+    poblation = objective.repair(np.random.default_rng(0).uniform(objective.lower, objective.upper, (5, 7)))
+    positions, heights = objective.layout(poblation)
+    B = objective.panel_dimensions[0]
+    expected = np.zeros((len(poblation), objective.n_rows))
+    for p in range(len(poblation)):
+        for j in range(objective.n_rows):
+            fraction = np.zeros(len(objective.energy))
+            for i in range(j):
+                distance = (positions[p, j] - positions[p, i]) + (heights[p, j] - heights[p, i]) / objective._tan_psi
+                fraction = np.maximum(fraction, shaded_fraction(distance, objective.inclination_degree, B,
+                                                                objective.elevation, objective.azimuth))
+            expected[p, j] = fraction @ objective.energy
+    np.testing.assert_allclose(objective.shading(poblation), expected, rtol=1e-9, atol=1e-9)
+
+def test_repair_keeps_rows_within_length():
+    objective = LayoutObjective(41, 12, 40000, terrain_slope=np.linspace(-5, 8, 11))
+    poblation = objective.repair(np.random.default_rng(1).uniform(objective.lower, objective.upper, (20, 11)))
+    assert np.all(poblation.sum(axis=1) <= objective.budget + 1e-6)
+    assert np.all(poblation >= objective.lower - 1e-9)
@@ -0,0 +1,42 @@
+import random
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from taller2ag import genetic_algorithm
+
+# Cada corrida saca todos sus números aleatorios de su propio generador: la
+# semilla registrada la reproduce y las corridas en hilos no interfieren.
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_recorded_seed_reproduces_run(engine):
+    first = genetic_algorithm(30, 41, "invierno", len_poblation=50, engine=engine)
+    again = genetic_algorithm(30, 41, "invierno", len_poblation=50, engine=engine, seed=first["seed"])
+    np.testing.assert_array_equal(first["bests"], again["bests"])
+
+@pytest.mark.parametrize("engine, make_rng", [("python", random.Random), ("numpy", np.random.default_rng)])
+def test_explicit_rng_equals_seed(engine, make_rng):
+    a = genetic_algorithm(20, 41, "invierno", engine=engine, rng=make_rng(5))
+    b = genetic_algorithm(20, 41, "invierno", engine=engine, seed=5)
+    np.testing.assert_array_equal(a["bests"], b["bests"])
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_threaded_runs_equal_sequential_runs(engine):
+    seeds = range(4)
+    sequential = [genetic_algorithm(40, 41, "invierno", len_poblation=100, engine=engine, seed=seed)["bests"]
+                  for seed in seeds]
+    threaded = [None] * len(seeds)
+    def work(i):
+        threaded[i] = genetic_algorithm(40, 41, "invierno", len_poblation=100, engine=engine, seed=seeds[i])["bests"]
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(len(seeds))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for a, b in zip(threaded, sequential):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,45 @@
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from taller2ag import PopulationStats, iter_generations
+
+TARGET = 3226.9
+
+def check(stats, poblation):
+    values = stats.as_dict()
+    assert values["mean"] == pytest.approx(statistics.fmean(poblation), rel=1e-12)
+    assert values["pstdev"] == pytest.approx(statistics.pstdev(poblation), rel=1e-9, abs=1e-9)
+    assert values["min"] == min(poblation)
+    assert values["max"] == max(poblation)
+    assert values["mean_fitness"] == pytest.approx(statistics.fmean(abs(x - TARGET) for x in poblation), rel=1e-9)
+
+def test_update_sequence_matches_statistics():
+    # la población se contrae poco a poco hacia un valor lejos del objetivo,
+    # el caso en que sumsq/n - media² cancela casi todas las cifras
+    rng = random.Random(4)
+    poblation = [rng.uniform(0, 10000) for _ in range(30)]
+    stats = PopulationStats(poblation, TARGET)
+    for step in range(3000):
+        spread = 1000 * 0.995**step
+        stats.update(rng.randrange(len(poblation)), 8000 + rng.uniform(-spread, spread))
+        check(stats, poblation)
+
+def test_collapsed_population_has_zero_pstdev():
+    rng = random.Random(0)
+    poblation = [rng.uniform(4000, 6000) for _ in range(30)]
+    stats = PopulationStats(poblation, TARGET)
+    for step in range(300):
+        stats.update(step % len(poblation), 5123.456789)
+    assert stats.as_dict()["pstdev"] == 0.0
+
+@pytest.mark.parametrize("seed", range(5))
+def test_steady_state_run_matches_statistics(seed):
+    for record in iter_generations(100, 41, "invierno", seed=seed, replacement="steady_state",
+                                   steady_state_size=4, len_poblation=30, include_population=True):
+        assert record["pstdev"] == pytest.approx(statistics.pstdev(record["population"]), rel=1e-9, abs=1e-9)